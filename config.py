@@ -11,6 +11,11 @@ except Exception:  # pragma: no cover
         return False
 
 _LAST_CFG: Optional[dict] = None
+# .env next to this file; resolved once at import rather than on every load
+_HERE_ENV: Path = Path(__file__).resolve().parent / ".env"
+_CWD_ENV_NAME = ".env"
+# init_runtime() results per env_path, so repeated callers don't re-locate and re-parse the .env
+_CFG_CACHE: Dict[Optional[str], Tuple[Dict[str, Any], Path]] = {}
 
 # ---------------- helpers
 
@@ -23,11 +28,21 @@ def _int(v: Optional[str], *, default: int) -> int:
     except ValueError:
         return default
 
+def _load_env_file(path: Path) -> Path:
+    """
+    Open and load a .env in a single step (no exists()/is_file() pre-checks).
+    Raises OSError if the path cannot be opened as a file.
+    """
+    with open(path, encoding="utf-8") as fh:
+        load_dotenv(stream=fh, override=False)
+    return path
+
 def _require_file(path: str | Path, *, description: str) -> Path:
     p = Path(path).expanduser().resolve()
-    if not p.exists() or not p.is_file():
-        raise RuntimeError(f"{description} not found at: {p}")
-    return p
+    try:
+        return _load_env_file(p)
+    except OSError as e:
+        raise RuntimeError(f"{description} not found at: {p}") from e
 
 def _require_env(name: str) -> str:
     val = os.getenv(name)
@@ -54,30 +69,20 @@ def load_env_or_fail(*, env_path: Optional[str] = None) -> Path:
 
     # 1) explicit
     if env_path:
-        env_file = _require_file(env_path, description="Explicit .env")
-        load_dotenv(env_file, override=False)
-        return env_file
+        return _require_file(env_path, description="Explicit .env")
 
     # 2) ENV_PATH
     env_path_env = os.getenv("ENV_PATH")
     if env_path_env:
-        env_file = _require_file(env_path_env, description="$ENV_PATH .env")
-        load_dotenv(env_file, override=False)
-        return env_file
-
-    # 3) CWD/.env
-    cwd_env = Path.cwd() / ".env"
-    tried.append(cwd_env)
-    if cwd_env.exists() and cwd_env.is_file():
-        load_dotenv(cwd_env, override=False)
-        return cwd_env
-
-    # 4) config.py sibling .env
-    here_env = Path(__file__).resolve().parent / ".env"
-    tried.append(here_env)
-    if here_env.exists() and here_env.is_file():
-        load_dotenv(here_env, override=False)
-        return here_env
+        return _require_file(env_path_env, description="$ENV_PATH .env")
+
+    # 3) CWD/.env, then 4) config.py sibling .env
+    for candidate in (Path.cwd() / _CWD_ENV_NAME, _HERE_ENV):
+        tried.append(candidate)
+        try:
+            return _load_env_file(candidate)
+        except OSError:
+            continue
 
     # Fail with helpful message
     tried_str = "\n  - ".join(str(p) for p in tried)
@@ -128,14 +133,29 @@ def init_runtime(*, env_path: Optional[str] = None) -> Tuple[Dict[str, Any], Pat
     One call:
       - require & load the .env
       - return (cfg, env_file_path)
+
+    The result is cached per env_path; use clear_config_cache() to force a reload.
+    Each call returns its own copy of cfg, so callers can't alter the cached one.
     """
-    env_file = load_env_or_fail(env_path=env_path)
-    cfg = read_config()
-    # retain for later access (optional)
     global _LAST_CFG
-    _LAST_CFG = {**cfg, "__env_loaded_from": str(env_file)}
+    cached = _CFG_CACHE.get(env_path)
+    if cached is None:
+        env_file = load_env_or_fail(env_path=env_path)
+        cfg = read_config()
+        cached = _CFG_CACHE[env_path] = ({**cfg, "__env_loaded_from": str(env_file)}, env_file)
+    cfg, env_file = cached
+    # retain for later access (optional)
+    _LAST_CFG = {k: dict(v) if isinstance(v, dict) else v for k, v in cfg.items()}
     return _LAST_CFG, env_file
 
+def clear_config_cache() -> None:
+    """
+    Drop cached init_runtime() results (e.g. after changing the .env in tests).
+    """
+    global _LAST_CFG
+    _CFG_CACHE.clear()
+    _LAST_CFG = None
+
 def get_last_config() -> Optional[dict]:
     """
     Return the last config produced by init_runtime(), or None if not called.
@@ -158,21 +178,24 @@ def make_audit_logger(cfg: Dict[str, Any]):
         id_hash_salt=a.get("id_hash_salt"),
     )
 
+_SQLALCHEMY_URL_TMPL = (
+    "mssql+pyodbc://{user}:{pwd}@{server}/{name}"
+    "?driver={driver}&Encrypt={encrypt}&TrustServerCertificate={tsc}"
+)
+
 def build_sqlalchemy_url(cfg: Dict[str, Any]) -> str:
     """
     Optional convenience: build a SQLAlchemy URL from discrete DB_* vars WITHOUT requiring a DSN var.
     You can ignore this if you already assemble the engine elsewhere.
     """
     db = cfg["db"]
-    user = db["user"]
-    pwd = db["password"]
-    server = db["server"]
-    name = db["name"]
-    driver = db["driver"].replace(" ", "+")  # URL param format
-    encrypt = db["encrypt"]
-    tsc = db["trust_server_certificate"]
     # Example for mssql+pyodbc:
-    return (
-        f"mssql+pyodbc://{user}:{pwd}@{server}/{name}"
-        f"?driver={driver}&Encrypt={encrypt}&TrustServerCertificate={tsc}"
-    )
\ No newline at end of file
+    return _SQLALCHEMY_URL_TMPL.format(
+        user=db["user"],
+        pwd=db["password"],
+        server=db["server"],
+        name=db["name"],
+        driver=db["driver"].replace(" ", "+"),  # URL param format
+        encrypt=db["encrypt"],
+        tsc=db["trust_server_certificate"],
+    )
@@ -6,6 +6,18 @@ from typing import Optional
 
 from config import init_runtime, build_sqlalchemy_url, read_config
 
+# Fixed shape of the ODBC connect string, resolved once at import:
+# (ODBC key, cfg['db'] key) pairs, then (ODBC key, env var, default) triples
+_ODBC_FROM_DB_CFG = (
+    ("DATABASE", "name"),
+    ("Encrypt", "encrypt"),
+    ("TrustServerCertificate", "trust_server_certificate"),
+)
+_ODBC_FROM_ENV = (
+    ("MARS_Connection", "DB_MARS", "yes"),
+    ("Connection Timeout", "DB_CONNECT_TIMEOUT", "15"),
+)
+
 def _odbc_connect_str_from_cfg(cfg: dict) -> str:
     """Optional: derive a classic ODBC connect string from the already-parsed cfg['db']."""
     db = cfg["db"]
@@ -16,24 +28,18 @@ def _odbc_connect_str_from_cfg(cfg: dict) -> str:
         server_value = f"{server_value}\\{instance}"
     elif port:
         server_value = f"{server_value},{port}"
-    parts = {
-        "DRIVER": db["driver"],
-        "SERVER": server_value,
-        "DATABASE": db["name"],
-        "Encrypt": db["encrypt"],
-        "TrustServerCertificate": db["trust_server_certificate"],
-        "MARS_Connection": os.getenv("DB_MARS", "yes"),
-        "Connection Timeout": os.getenv("DB_CONNECT_TIMEOUT", "15"),
-    }
+    parts = [("DRIVER", db["driver"]), ("SERVER", server_value)]
+    parts.extend((key, db[cfg_key]) for key, cfg_key in _ODBC_FROM_DB_CFG)
+    parts.extend((key, os.getenv(env, default)) for key, env, default in _ODBC_FROM_ENV)
     # use UID/PWD unless integrated security is requested
     use_integrated = os.getenv("DB_INTEGRATED_SECURITY", "").strip().lower() in {"1","true","yes","on"}
     if use_integrated:
-        parts["Trusted_Connection"] = "yes"
+        parts.append(("Trusted_Connection", "yes"))
     else:
-        parts["UID"] = db["user"]
-        parts["PWD"] = db["password"]
+        parts.append(("UID", db["user"]))
+        parts.append(("PWD", db["password"]))
 
-    return ";".join(f"{k}={v}" for k, v in parts.items())
+    return ";".join(f"{k}={v}" for k, v in parts)
 
 def get_sqlalchemy_url(*, env_path: Optional[str] = None) -> str:
     """
@@ -45,7 +51,8 @@ def get_sqlalchemy_url(*, env_path: Optional[str] = None) -> str:
     if url:
         return url
 
-    # Ask the application config to load the .env (external path or auto-discovery)
+    # Ask the application config to load the .env (external path or auto-discovery;
+    # cached by init_runtime, so clear_config_cache() also resets the URL)
     cfg, _ = init_runtime(env_path=env_path)
 
     odbc = _odbc_connect_str_from_cfg(cfg)
@@ -1,8 +1,11 @@
 # connection/fetcher.py
 from __future__ import annotations
 
-from functools import wraps
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from uuid import uuid4
 from typing import (
+    TYPE_CHECKING,
     Any,
     Callable,
     Iterable,
@@ -15,10 +18,15 @@ from typing import (
 )
 
 import logging
-import pandas as pd
-from sqlalchemy.orm import Session
+from sqlalchemy import BigInteger, Column, MetaData, Table, insert, select
 
-from .session import get_session
+from .session import current_shared_session, get_session, shared_session
+
+if TYPE_CHECKING:  # pandas is imported lazily by the DataFrame helpers
+    import pandas as pd
+    from sqlalchemy.orm import Session
+
+_MODULE_LOGGER = logging.getLogger(__name__)
 
 # ---- Types -------------------------------------------------------------------
 
@@ -35,14 +43,26 @@ class QueryFunc(Protocol):
 
 # ---- Decorators --------------------------------------------------------------
 
+@contextmanager
+def _session_scope() -> Iterator[Session]:
+    """The thread's shared_session() if one is open, else a fresh get_session()."""
+    shared = current_shared_session()
+    if shared is not None:
+        yield shared
+        return
+    with get_session() as db:
+        yield db
+
+
 def with_db_session(fn: QueryFunc) -> Callable[..., Iterable[Row]]:
     """
     Decorator that opens a DB session for a single call to `fn`, making sure
-    the session is always cleaned up afterwards.
+    the session is always cleaned up afterwards. Inside `shared_session()` the
+    shared session is used instead.
     """
     @wraps(fn)
     def wrapper(*args, **kwargs) -> Iterable[Row]:
-        with get_session() as db:
+        with _session_scope() as db:
             return fn(*args, session=db, **kwargs)
     return wrapper
 
@@ -57,19 +77,27 @@ class Fetcher:
     --------
     - Simple call returning a **list** of rows (mappings)
     - `.iter()` for streaming rows (generator) under a single session
-    - `.to_df()` convenience (handles empty gracefully)
+    - `.to_df()` convenience (handles empty gracefully); materializes all rows
+      as Python objects first, then builds the frame
+    - `.to_arrow()` `pyarrow.Table` built from streamed batches of row dicts,
+      holding at most `batch_size` rows in Python at a time
     - `.to_csv()` / `.to_parquet()` convenience writers
     - `.with_defaults()` for pre-binding params
     - `.batched_iter()` / `.batched_to_df()` to chunk a large list parameter
       while reusing a single DB session
+    - `.batched_iter_server_side()` to ship a large list parameter to a temp
+      table and run the query once instead of once per chunk
 
     Optional
     --------
     - `transform`: callable applied to each row before returning (e.g., to cast
       columns, validate, or map to Pydantic models).
     - `logger`: basic progress logging for batched calls.
+    - `Fetcher.shared_session()`: reuse one session across several calls.
     """
 
+    shared_session = staticmethod(shared_session)
+
     def __init__(
         self,
         func: QueryFunc,
@@ -82,12 +110,13 @@ class Fetcher:
         self.func = func
         self.defaults: dict[str, Any] = dict(defaults or {})
         self.transform = transform
-        self.logger = logger or logging.getLogger(__name__)
+        self.logger = logger or _MODULE_LOGGER
         self.name = name or getattr(func, "__name__", "query")
 
         @with_db_session
         def _runner(*, session: Session, **params) -> Iterable[Row]:
-            return self.func(session=session, **{**self.defaults, **params})
+            # materialize while the session is open (query funcs may stream)
+            return list(self.func(session=session, **self._merged(params)))
 
         self._runner = _runner
 
@@ -100,15 +129,20 @@ class Fetcher:
 
     def iter(self, **overrides) -> Iterator[T] | Iterator[Row]:
         """Stream rows under a single session (useful for large result sets)."""
-        params = {**self.defaults, **overrides}
-        def _gen() -> Iterator[T] | Iterator[Row]:
-            with get_session() as db:
-                for r in self.func(session=db, **params):
-                    yield self.transform(r) if self.transform else r
-        return _gen()
+        params = self._merged(overrides)
+        transform = self.transform
+        def _gen_raw() -> Iterator[Row]:
+            with _session_scope() as db:
+                yield from self.func(session=db, **params)
+        def _gen_xform() -> Iterator[T]:
+            with _session_scope() as db:
+                yield from map(transform, self.func(session=db, **params))
+        return _gen_raw() if transform is None else _gen_xform()
 
     def to_df(self, **overrides) -> pd.DataFrame:
         """Return a pandas DataFrame (empty frame if no rows)."""
+        import pandas as pd
+
         rows = list(self.iter(**overrides))  # keep logic unified
         if not rows:
             return pd.DataFrame()
@@ -117,6 +151,29 @@ class Fetcher:
             return pd.DataFrame.from_records(rows)
         return pd.DataFrame(rows)
 
+    def to_arrow(self, batch_size: int = 10_000, **overrides):
+        """Return a `pyarrow.Table`, built column-wise from streamed row batches.
+
+        Rows must be mappings. Each batch of row dicts is converted with
+        `pa.Table.from_pylist`, so values still pass through Python objects, but
+        unlike `to_df()` no list of all rows is materialized: only `batch_size`
+        rows are held in Python at a time. Requires `pyarrow`.
+        """
+        import pyarrow as pa
+        from itertools import islice
+
+        it = self.iter(**overrides)
+        tables = []
+        while True:
+            chunk = list(islice(it, batch_size))
+            if not chunk:
+                break
+            tables.append(pa.Table.from_pylist(chunk))
+        if not tables:
+            return pa.table({})
+        # batches may infer different types (e.g. all-null columns) -> unify
+        return pa.concat_tables(tables, promote_options="default")
+
     def to_csv(self, path: str, index: bool = False, **overrides) -> str:
         """Write results to CSV and return the file path."""
         df = self.to_df(**overrides)
@@ -144,7 +201,7 @@ class Fetcher:
     # ---------------- batching ------------------------------------------------
 
     def _call_with_session(self, db: Session, **params) -> list[Row]:
-        return list(self.func(session=db, **{**self.defaults, **params}))
+        return list(self.func(session=db, **self._merged(params)))
 
     def batched_iter(
         self,
@@ -168,26 +225,83 @@ class Fetcher:
             yield from self.iter(**overrides)
             return
 
-        seq_list = list(seq)
-        n = len(seq_list)
+        n = len(seq)
         if n == 0 or n <= max_items:
-            yield from self.iter(**overrides)
+            yield from self.iter(**{**overrides, list_param: _as_param_list(seq)})
             return
 
-        with get_session() as db:
+        # Sequences (and 1-D arrays) slice directly; no full copy of the input
+        transform = self.transform
+        with _session_scope() as db:
             for i in range(0, n, max_items):
-                chunk = seq_list[i : i + max_items]
+                chunk = _as_param_list(seq[i : i + max_items])
                 params = {**overrides, list_param: chunk}
                 rows = self._call_with_session(db, **params)
                 if not rows:
                     continue
-                for r in rows:
-                    yield self.transform(r) if self.transform else r
+                if transform is None:
+                    yield from rows
+                else:
+                    yield from map(transform, rows)
                 self.logger.debug(
                     "[%s] fetched %d/%d items (chunk %d..%d)",
                     self.name, i + len(chunk), n, i, i + len(chunk) - 1
                 )
 
+    def batched_iter_server_side(
+        self,
+        *,
+        list_param: str,
+        id_type: Any = None,
+        **overrides,
+    ) -> Iterator[T] | Iterator[Row]:
+        """
+        Like `batched_iter()`, but instead of one SELECT per chunk the whole
+        sequence in `list_param` is bulk-inserted into a session-local temp table
+        (`fast_executemany` is enabled on the engine) and the query runs once.
+
+        The query function receives `select(<tmp>.id)` in place of the list, so
+        this works for any query that passes the parameter to `.in_(...)`.
+        `id_type` is the SQL type of the temp table column (default BigInteger;
+        for case numbers use `Unicode(50, "Latin1_General_CI_AS")` so the
+        comparison doesn't hit a tempdb collation conflict).
+        """
+        seq = (
+            overrides.get(list_param)
+            if list_param in overrides
+            else self.defaults.get(list_param)
+        )
+
+        if not _is_batchable_sequence(seq):
+            yield from self.iter(**overrides)
+            return
+
+        ids = list(dict.fromkeys(_as_param_list(seq)))  # the temp table keys on id
+        if not ids:
+            yield from self.iter(**overrides)
+            return
+
+        tmp = Table(
+            f"#ids_{uuid4().hex[:12]}",
+            MetaData(),
+            Column("id", id_type if id_type is not None else BigInteger(), primary_key=True),
+        )
+        transform = self.transform
+        with _session_scope() as db:
+            conn = db.connection()
+            tmp.create(conn)
+            try:
+                db.execute(insert(tmp), [{"id": x} for x in ids])
+                self.logger.debug("[%s] staged %d items in %s", self.name, len(ids), tmp.name)
+                params = {**overrides, list_param: select(tmp.c.id)}
+                rows = self.func(session=db, **self._merged(params))
+                if transform is None:
+                    yield from rows
+                else:
+                    yield from map(transform, rows)
+            finally:
+                tmp.drop(conn)
+
     def batched_to_df(
         self,
         *,
@@ -196,6 +310,8 @@ class Fetcher:
         **overrides,
     ) -> pd.DataFrame:
         """DataFrame wrapper over `batched_iter()`."""
+        import pandas as pd
+
         rows = list(self.batched_iter(list_param=list_param, max_items=max_items, **overrides))
         if not rows:
             return pd.DataFrame()
@@ -206,10 +322,19 @@ class Fetcher:
 
     # ----- helpers ------------------------------------------------------------
 
+    def _merged(self, overrides: Mapping[str, Any]) -> Mapping[str, Any]:
+        """Defaults merged with overrides; no copy when there is nothing to override."""
+        if not overrides:
+            return self.defaults
+        if not self.defaults:
+            return overrides
+        return {**self.defaults, **overrides}
+
     def _apply_transform(self, rows: list[Row]) -> list[T] | list[Row]:
-        if not rows or self.transform is None:
+        transform = self.transform
+        if not rows or transform is None:
             return rows  # type: ignore[return-value]
-        return [self.transform(r) for r in rows]
+        return list(map(transform, rows))
 
 
 # ---- Standalone helpers ------------------------------------------------------
@@ -217,12 +342,38 @@ class Fetcher:
 def _is_batchable_sequence(obj: Any) -> bool:
     if obj is None:
         return False
+    if type(obj) in (list, tuple):  # common case: skip the ABC check
+        return True
     if isinstance(obj, (str, bytes, dict)):
         return False
+    if getattr(obj, "ndim", None) == 1 and hasattr(obj, "tolist"):  # numpy array / pandas Series
+        return True
     return isinstance(obj, Sequence)
 
-def make_fetcher(func: QueryFunc, **defaults) -> Fetcher:
-    return Fetcher(func, defaults)
+def _as_param_list(seq: Any) -> Any:
+    """Array-likes -> list of native Python scalars (what the DB driver expects)."""
+    return seq.tolist() if hasattr(seq, "tolist") else seq
+
+@lru_cache(maxsize=256)
+def _cached_fetcher(func: QueryFunc, transform: Any, frozen_defaults: frozenset) -> Fetcher:
+    return Fetcher(func, dict(frozen_defaults), transform=transform)
+
+def make_fetcher(
+    func: QueryFunc,
+    *,
+    transform: Optional[Callable[[Row], T]] = None,
+    **defaults,
+) -> Fetcher:
+    """
+    Fetchers are reused per (func, transform, defaults), so repeated
+    `fetch_data()` calls don't rebuild the wrapper. The returned instance is
+    shared: use `.with_defaults()` rather than mutating it. Unhashable
+    defaults (e.g. a list of IDs) get a fresh, uncached Fetcher.
+    """
+    try:
+        return _cached_fetcher(func, transform, frozenset(defaults.items()))
+    except TypeError:
+        return Fetcher(func, defaults, transform=transform)
 
 def fetch_data(func: QueryFunc, **kwargs) -> pd.DataFrame:
     return make_fetcher(func).to_df(**kwargs)
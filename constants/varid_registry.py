@@ -1,4 +1,5 @@
 # constants/varid_registry
+from functools import lru_cache
 from typing import Final
 
 VARIDS: Final[dict[str, int]] = {
@@ -9,10 +10,16 @@ VARIDS: Final[dict[str, int]] = {
 # --- interaction methods ---
 
 def varid(name: str) -> int:
+    # canonical (upper-case) names hit the dict directly; others are normalized
+    try:
+        return VARIDS[name]
+    except KeyError:
+        pass
     try:
         return VARIDS[name.upper()]
     except KeyError as e:
         raise ValueError(f"Unknown VARID: {name}") from e
 
-def varids(*names: str) -> list[int]:
-    return [varid(n) for n in names]
\ No newline at end of file
+@lru_cache(maxsize=None)
+def varids(*names: str) -> tuple[int, ...]:
+    return tuple(varid(n) for n in names)
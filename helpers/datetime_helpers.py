@@ -1,5 +1,37 @@
 # helpers/datetime_helpers.py
-from datetime import date, datetime
+from __future__ import annotations
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
+from zoneinfo import ZoneInfo
 
-def _age(dob: date, reference: date = date.today()) -> int:
-    return reference.year - dob.year - ((reference.month, reference.day) < (dob.month, dob.day))
\ No newline at end of file
+if TYPE_CHECKING:
+    import pandas as pd
+
+_BERLIN = ZoneInfo("Europe/Berlin")
+
+def _utc_to_berlin(value: datetime) -> datetime:
+    """UTC datetime (naive values are taken as UTC) -> aware Europe/Berlin datetime (DST-aware)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(_BERLIN)
+
+@lru_cache(maxsize=4096)
+def _age_on(dob: date, reference: date) -> int:
+    """Completed years at `reference`; memoized, since batches repeat birth and admission dates."""
+    return reference.year - dob.year - ((reference.month, reference.day) < (dob.month, dob.day))
+
+def _age(dob: date, reference: Optional[date] = None) -> int:
+    # "today" is resolved before the cache lookup, so cached ages never go stale across midnight
+    return _age_on(dob, reference or date.today())
+
+def _age_series(dob: "pd.Series", reference: Optional[date] = None) -> "pd.Series":
+    """Vectorized `_age` over a column of birth dates (NaT/None -> <NA>)."""
+    import pandas as pd
+
+    ref = reference or date.today()
+    dob_ts = pd.to_datetime(dob)
+    month, day = dob_ts.dt.month, dob_ts.dt.day
+    before_birthday = (month > ref.month) | ((month == ref.month) & (day > ref.day))
+    years = ref.year - dob_ts.dt.year - before_birthday.astype("int64")
+    return years.astype("Int64")
@@ -1,13 +1,49 @@
 # helpers/hashing.py
 import hashlib
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, Iterable, Optional
+
+# BLAKE2b limits: keys up to 64 bytes, digests up to 64 bytes
+_MAX_KEY = 64
+_MAX_DIGEST = 64
+
+def _key(salt: str) -> bytes:
+    key = salt.encode("utf-8")
+    # longer salts are condensed to a full-size key rather than rejected
+    return key if len(key) <= _MAX_KEY else hashlib.blake2b(key).digest()
+
+def _digest_size(length: int) -> int:
+    return min(_MAX_DIGEST, max(1, (length + 1) // 2))
 
 def hash_value(value: str, *, salt: Optional[str] = None, length: int = 12) -> str:
     """
-    Return a SHA-256 hash of `value` salted with `salt`.
+    Return a keyed BLAKE2b hash of `value` (hex, `length` chars) with `salt` as key.
     If no salt is provided, returns the original value unchanged.
     """
     if not salt:
         return value
-    h = hashlib.sha256((salt + value).encode("utf-8")).hexdigest()
-    return h[:length]
\ No newline at end of file
+    h = hashlib.blake2b(value.encode("utf-8"), key=_key(salt), digest_size=_digest_size(length))
+    return h.hexdigest()[:length]
+
+@lru_cache(maxsize=64)
+def make_hasher(salt: Optional[str], *, length: int = 12) -> Callable[[str], str]:
+    """
+    Return a callable equivalent to `hash_value(v, salt=salt, length=length)` for
+    hashing many values with the same salt: the keyed BLAKE2b state (sized to
+    `length`) is set up once and each call only copies it. Hashers are cached
+    per (salt, length), so per-row callers can look one up cheaply.
+    """
+    if not salt:
+        return lambda value: value
+    base = hashlib.blake2b(key=_key(salt), digest_size=_digest_size(length))
+
+    def _hash(value: str) -> str:
+        h = base.copy()
+        h.update(value.encode("utf-8"))
+        return h.hexdigest()[:length]
+
+    return _hash
+
+def hash_value_many(values: Iterable[str], *, salt: Optional[str] = None, length: int = 12) -> list[str]:
+    """`hash_value` over many values with one (cached) salted hasher."""
+    return list(map(make_hasher(salt, length=length), values))
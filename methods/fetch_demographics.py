@@ -1,28 +1,47 @@
 # methods/fetch_demographics.py
+from functools import lru_cache
 from typing import Sequence
-from sqlalchemy import select, join
+from sqlalchemy import bindparam, select, join, outerjoin
 from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql import ClauseElement
 
 from models.sql_patient import Patient
 from models.sql_fall import Fall
 from constants.varid_registry import varids
-from .mssql_helpers._decimals import _nearest_decimal_val_to_dt, _latest_decimal_val
-from .mssql_helpers._time_conversion import _to_berlin_time_iso
+from .mssql_helpers._decimals import _decimal_vals_by_owner
+from helpers.datetime_helpers import _utc_to_berlin
 
+# metric field -> VARID name in constants.varid_registry
+_METRIC_FIELDS = {
+    "patient_body_weight": "BODY_WEIGHT",
+    "patient_body_height": "BODY_HEIGHT",
+}
 
-def _metric_expr(*, varid: int, p, ref_dt=None):
-    """If ref_dt is given, take the value nearest to that datetime; else take latest overall."""
-    return (
-        _nearest_decimal_val_to_dt(varid=varid, p=p, ref_dt=ref_dt)
-        if ref_dt is not None
-        else _latest_decimal_val(varid=varid, p=p)
+
+def _metrics_subquery(*, fields: Sequence[str], source, owner_id, patient_id, ref_dt=None):
+    """
+    Pivoted BODY_* values (one row per owner) for the requested metric fields,
+    or None if no metric field was requested.
+    If ref_dt is given, take the value nearest to that datetime; else take latest overall.
+    """
+    wanted = [name for name in _METRIC_FIELDS if name in fields]
+    if not wanted:
+        return None
+    ids = varids(*(_METRIC_FIELDS[name] for name in wanted))
+    return _decimal_vals_by_owner(
+        metrics=dict(zip(wanted, ids)),
+        source=source,
+        owner_id=owner_id,
+        patient_id=patient_id,
+        ref_dt=ref_dt,
     )
 
 
-def _build_field_map(*, p, f=None, fields: Sequence[str], ref_dt_for_metrics=None):
+def _build_field_map(*, p, f=None, fields: Sequence[str], metrics=None):
     """
-    Make a unified field map. If a Fall alias f is supplied, case_* fields are available.
-    ref_dt_for_metrics controls BODY_* selection (nearest to admission vs latest).
+    Make a unified field map from Patient/Fall columns (`p`, `f`: aliases or CTE
+    column collections). If f is supplied, case_* fields are available.
+    `metrics` is the subquery from _metrics_subquery() (already outer-joined by the caller).
     """
     field_map = {
         "patient_id": p.ID.label("patient_id"),
@@ -35,24 +54,17 @@ def _build_field_map(*, p, f=None, fields: Sequence[str], ref_dt_for_metrics=Non
         field_map.update(
             {
                 "case_number": f.FALLNR.label("case_number"),
-                "case_admission_time": _to_berlin_time_iso(value=f.AUFN).label("case_admission_time"),
-                "case_discharge_time": _to_berlin_time_iso(value=f.ENTL).label("case_discharge_time"),
+                # raw UTC; fetch_demography_for_cases converts via berlin_case_times()
+                "case_admission_time": f.AUFN.label("case_admission_time"),
+                "case_discharge_time": f.ENTL.label("case_discharge_time"),
             }
         )
 
     # Dynamic metrics only if requested
-    need_weight = "patient_body_weight" in fields
-    need_height = "patient_body_height" in fields
-    if need_weight or need_height:
-        BODY_WEIGHT, BODY_HEIGHT = varids("BODY_WEIGHT", "BODY_HEIGHT")
-        if need_weight:
-            field_map["patient_body_weight"] = _metric_expr(
-                varid=BODY_WEIGHT, p=p, ref_dt=ref_dt_for_metrics
-            ).label("patient_body_weight")
-        if need_height:
-            field_map["patient_body_height"] = _metric_expr(
-                varid=BODY_HEIGHT, p=p, ref_dt=ref_dt_for_metrics
-            ).label("patient_body_height")
+    if metrics is not None:
+        for name in _METRIC_FIELDS:
+            if name in metrics.c:
+                field_map[name] = metrics.c[name].label(name)
 
     # Validate requested fields
     unknown = [name for name in fields if name not in field_map]
@@ -62,70 +74,167 @@ def _build_field_map(*, p, f=None, fields: Sequence[str], ref_dt_for_metrics=Non
     return field_map
 
 
-def _execute_select(session: Session, selectable, fields, field_map, whereclause=None):
-    stmt = (
-        select(*(field_map[name] for name in fields))
-        .select_from(selectable)
-        .distinct()
-    )
+_CASE_TIME_FIELDS = ("case_admission_time", "case_discharge_time")
+
+
+def berlin_case_times(row):
+    """
+    Row transform applied by fetch_demography_for_cases(): case_* times come back
+    from SQL as UTC and are converted here to aware Europe/Berlin datetimes. Much
+    cheaper than AT TIME ZONE + string formatting on the server.
+    """
+    out = dict(row)
+    to_berlin = _utc_to_berlin
+    for name in _CASE_TIME_FIELDS:
+        value = out.get(name)
+        if value is not None:
+            out[name] = to_berlin(value)
+    return out
+
+
+# rows per driver fetchmany() when streaming; matches the pipeline's chunk size
+_STREAM_BATCH = 10_000
+
+
+def _build_select(selectable, fields, field_map, whereclause=None, *, distinct: bool = True):
+    """
+    distinct=False skips the server-side DISTINCT; only pass it when the FROM/WHERE
+    already guarantees one row per key (e.g. a single-table select on the PK).
+    """
+    stmt = select(*(field_map[name] for name in fields)).select_from(selectable)
+    if distinct:
+        stmt = stmt.distinct()
     if whereclause is not None:
         stmt = stmt.where(whereclause)
-    return session.execute(stmt).mappings().fetchall()
+    return stmt
 
 
-def fetch_demography_for_cases(
-    session: Session,
-    case_numbers: Sequence[str],
-    fields: Sequence[str] | None = None,
-):
+def _execute(session: Session, stmt, params=None, *, stream: bool = False):
+    """
+    stream=True returns a lazily consumed server-side cursor instead of a list;
+    it must be exhausted while `session` is still open, one stream per session.
+    """
+    if stream:
+        result = session.execute(
+            stmt,
+            params,
+            # yield_per implies stream_results with a fixed-size row buffer
+            execution_options={"yield_per": _STREAM_BATCH},
+        )
+        return result.mappings()
+    return session.execute(stmt, params).mappings().fetchall()
+
+
+def _cases_select(fields: Sequence[str], case_numbers):
     p = aliased(Patient)
-    f = aliased(Fall)
-
-    # Defaults match current behavior
-    if not fields:
-        fields = [
-            "patient_id",
-            "case_number",
-            "patient_date_of_birth",
-            "patient_sex",
-            "case_admission_time",
-            "case_discharge_time",
-        ]
+
+    # The requested cases, bound once: the outer select and the metrics window both
+    # read this CTE, so the (expanding) ID list appears a single time in the SQL
+    # and counts once against SQL Server's 2100-parameter limit.
+    cases = (
+        select(Fall.ID, Fall.Patient_ID, Fall.FALLNR, Fall.AUFN, Fall.ENTL)
+        .where(Fall.FALLNR.in_(case_numbers))
+        .cte("target_cases")
+    )
+    f = cases.c
 
     # For cases, prefer measurements nearest to admission time
-    field_map = _build_field_map(
-        p=p,
-        f=f,
+    metrics = _metrics_subquery(
         fields=fields,
-        ref_dt_for_metrics=f.AUFN,
+        source=cases,
+        owner_id=f.ID,
+        patient_id=f.Patient_ID,
+        ref_dt=f.AUFN,
     )
+    field_map = _build_field_map(p=p, f=f, fields=fields, metrics=metrics)
 
-    selectable = join(p, f, p.ID == f.Patient_ID)
-    whereclause = f.FALLNR.in_(case_numbers)
+    selectable = join(p, cases, p.ID == f.Patient_ID)
+    if metrics is not None:
+        selectable = outerjoin(selectable, metrics, metrics.c.owner_id == f.ID)
 
-    return _execute_select(session, selectable, fields, field_map, whereclause)
+    return _build_select(selectable, fields, field_map)
 
 
-def fetch_demography_for_patients(
+def _patients_select(fields: Sequence[str], patient_ids):
+    # requested patients, bound once (see _cases_select)
+    patients = (
+        select(Patient.ID, Patient.GEB, Patient.GESCHLECHT)
+        .where(Patient.ID.in_(patient_ids))
+        .cte("target_patients")
+    )
+    p = patients.c
+
+    # For patients, use latest measurements overall
+    metrics = _metrics_subquery(
+        fields=fields,
+        source=patients,
+        owner_id=p.ID,
+        patient_id=p.ID,
+    )
+    field_map = _build_field_map(p=p, f=None, fields=fields, metrics=metrics)
+
+    selectable = patients
+    if metrics is not None:
+        selectable = outerjoin(patients, metrics, metrics.c.owner_id == p.ID)
+
+    # p.ID is the primary key and metrics hold one row per patient -> rows are already unique
+    return _build_select(selectable, fields, field_map, distinct=False)
+
+
+# Defaults match current behavior
+_DEFAULT_CASES_FIELDS: tuple[str, ...] = (
+    "patient_id",
+    "case_number",
+    "patient_date_of_birth",
+    "patient_sex",
+    "case_admission_time",
+    "case_discharge_time",
+)
+_DEFAULT_PATIENTS_FIELDS: tuple[str, ...] = ("patient_id", "patient_date_of_birth", "patient_sex")
+
+
+# Statements are built once per field tuple; the IDs bind through an expanding
+# parameter, so repeat calls skip alias/label/subquery construction entirely.
+@lru_cache(maxsize=64)
+def _cached_cases_select(fields: tuple[str, ...]):
+    return _cases_select(fields, bindparam("case_numbers", expanding=True))
+
+
+@lru_cache(maxsize=64)
+def _cached_patients_select(fields: tuple[str, ...]):
+    return _patients_select(fields, bindparam("patient_ids", expanding=True))
+
+
+def fetch_demography_for_cases(
     session: Session,
-    patient_ids: Sequence[int],
+    case_numbers: Sequence[str],
     fields: Sequence[str] | None = None,
+    stream: bool = False,
 ):
-    p = aliased(Patient)
+    fields = tuple(fields) if fields else _DEFAULT_CASES_FIELDS
 
-    # Defaults match current behavior
-    if not fields:
-        fields = ["patient_id", "patient_date_of_birth", "patient_sex"]
+    # SQL expressions (e.g. a temp-table select) can't be bound as parameters
+    if isinstance(case_numbers, ClauseElement):
+        rows = _execute(session, _cases_select(fields, case_numbers), stream=stream)
+    else:
+        stmt = _cached_cases_select(fields)
+        rows = _execute(session, stmt, {"case_numbers": list(case_numbers)}, stream=stream)
 
-    # For patients, use latest measurements overall
-    field_map = _build_field_map(
-        p=p,
-        f=None,
-        fields=fields,
-        ref_dt_for_metrics=None,
-    )
+    # case_* times are selected as UTC; callers always get Berlin local time
+    if not any(name in fields for name in _CASE_TIME_FIELDS):
+        return rows
+    return map(berlin_case_times, rows) if stream else [berlin_case_times(row) for row in rows]
 
-    selectable = p
-    whereclause = p.ID.in_(patient_ids)
 
-    return _execute_select(session, selectable, fields, field_map, whereclause)
\ No newline at end of file
+def fetch_demography_for_patients(
+    session: Session,
+    patient_ids: Sequence[int],
+    fields: Sequence[str] | None = None,
+    stream: bool = False,
+):
+    fields = tuple(fields) if fields else _DEFAULT_PATIENTS_FIELDS
+
+    if isinstance(patient_ids, ClauseElement):
+        return _execute(session, _patients_select(fields, patient_ids), stream=stream)
+    stmt = _cached_patients_select(fields)
+    return _execute(session, stmt, {"patient_ids": list(patient_ids)}, stream=stream)
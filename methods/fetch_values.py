@@ -0,0 +1,59 @@
+# methods/fetch_values.py
+from itertools import chain
+from typing import Iterator, Sequence
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models.sql_datadecimal63 import CO6DataDecimal63
+
+# default projection; the value tables are wide (Timestamp, versioning, users)
+_VALUE_COLUMNS = ("Parent_ID", "VarID", "DateTimeTo", "val")
+
+# rows per partition, also the driver fetch size
+_PARTITION_SIZE = 10_000
+
+
+def iter_value_partitions(
+    session: Session,
+    patient_ids: Sequence[int],
+    var_ids: Sequence[int],
+    *,
+    model=CO6DataDecimal63,
+    columns: Sequence[str] = _VALUE_COLUMNS,
+    partition_size: int = _PARTITION_SIZE,
+) -> Iterator[list]:
+    """
+    Current (FlagCurrent, not deleted) rows of a CO6 value table, e.g.
+    CO6DataDecimal63 or DataStringV, for the given patients and VARIDs.
+
+    Reads through the Core table (`model.__table__`) rather than the ORM entity,
+    so rows come back as plain mappings without object hydration or identity-map
+    bookkeeping, in lists of up to `partition_size` rows from a server-side cursor.
+    Must be consumed while `session` is open.
+    """
+    t = model.__table__
+    stmt = select(*(t.c[name] for name in columns)).where(
+        t.c.Parent_ID.in_(patient_ids),
+        t.c.VarID.in_(list(var_ids)),
+        t.c.deleted == 0,
+        t.c.FlagCurrent == 1,
+    )
+    result = session.execute(
+        stmt,
+        execution_options={"yield_per": partition_size, "stream_results": True},
+    )
+    yield from result.mappings().partitions()
+
+
+def fetch_values_for_patients(
+    session: Session,
+    patient_ids: Sequence[int],
+    var_ids: Sequence[int],
+    *,
+    model=CO6DataDecimal63,
+    columns: Sequence[str] = _VALUE_COLUMNS,
+):
+    """Row-wise view of iter_value_partitions(), usable as a Fetcher query function."""
+    return chain.from_iterable(
+        iter_value_partitions(session, patient_ids, var_ids, model=model, columns=columns)
+    )
@@ -1,41 +1,52 @@
 # methods/mssql_helpers/_decimals
-from sqlalchemy import select, func, literal_column
-from sqlalchemy.orm import Session, aliased
+from sqlalchemy import case, select, func, literal_column
+from sqlalchemy.orm import aliased
 from models.sql_datadecimal63 import CO6DataDecimal63
 
-def _nearest_decimal_val_to_dt(*, varid: int, p, ref_dt):
+
+def _decimal_vals_by_owner(*, metrics, source, owner_id, patient_id, ref_dt=None):
     """
-    Returns a correlated scalar subquery selecting the value for `varid`
-    nearest to `ref_dt` for patient alias `p`.
+    Returns a subquery with one row per `owner_id` and one column per entry in
+    `metrics` (label -> varid), holding the value nearest to `ref_dt` (or the
+    latest value if ref_dt is None).
+
+    All metrics are ranked in a single ROW_NUMBER() window over the decimal table
+    and pivoted with MAX(CASE ...), instead of one correlated subquery per metric
+    and row. `source` provides owner/patient/ref_dt columns and should already be
+    restricted to the outer query's rows (e.g. a CTE the outer query also selects
+    from), so the window only sees those rows and their IDs are bound once.
     """
     d = aliased(CO6DataDecimal63)
-    return (
-        select(d.val)
+    order_by = (
+        func.abs(func.datediff(literal_column("second"), d.DateTimeTo, ref_dt))
+        if ref_dt is not None
+        else d.DateTimeTo.desc()
+    )
+    ranked = (
+        select(
+            owner_id.label("owner_id"),
+            d.VarID.label("VarID"),
+            d.val.label("val"),
+            func.row_number().over(partition_by=(owner_id, d.VarID), order_by=order_by).label("rn"),
+        )
+        .select_from(source)
+        .join(d, d.Parent_ID == patient_id)
         .where(
-            d.Parent_ID == p.ID,
-            d.VarID == varid,
+            d.VarID.in_(list(metrics.values())),
             d.deleted == 0,
             d.FlagCurrent == 1,
         )
-        .order_by(func.abs(func.datediff(literal_column("second"), d.DateTimeTo, ref_dt)))
-        .limit(1)
-        .scalar_subquery()
+        .subquery()
     )
-
-def _latest_decimal_val(*, varid: int, p):
-    """
-    Returns a correlated scalar subquery selecting the latest value for `varid` for patient alias `p`.
-    """
-    d = aliased(CO6DataDecimal63)
     return (
-        select(d.val)
-        .where(
-            d.Parent_ID == p.ID,
-            d.VarID == varid,
-            d.deleted == 0,
-            d.FlagCurrent == 1,
+        select(
+            ranked.c.owner_id,
+            *(
+                func.max(case((ranked.c.VarID == varid, ranked.c.val))).label(label)
+                for label, varid in metrics.items()
+            ),
         )
-        .order_by(d.DateTimeTo.desc())
-        .limit(1)
-        .scalar_subquery()
-    )
\ No newline at end of file
+        .where(ranked.c.rn == 1)
+        .group_by(ranked.c.owner_id)
+        .subquery()
+    )
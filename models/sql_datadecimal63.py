@@ -3,7 +3,6 @@ from sqlalchemy import BINARY, BigInteger, Boolean, DECIMAL, DateTime, Index, In
 from sqlalchemy.orm import Mapped, mapped_column
 from typing import Optional
 import datetime
-import decimal
 
 # Patient : CO6_Data_Decimal_6_3
 class CO6DataDecimal63(Base):
@@ -28,7 +27,7 @@ class CO6DataDecimal63(Base):
     Parent_VarID: Mapped[int] = mapped_column(Integer)
     DateTimeTo: Mapped[datetime.datetime] = mapped_column(DateTime)
     validated: Mapped[bool] = mapped_column(Boolean)
-    val: Mapped[decimal.Decimal] = mapped_column(DECIMAL(9, 3))
+    val: Mapped[float] = mapped_column(DECIMAL(9, 3, asdecimal=False))  # float at the driver boundary
     FlagCurrent: Mapped[bool] = mapped_column(Boolean)
     Timestamp: Mapped[bytes] = mapped_column(BINARY(8))
 
@@ -52,7 +51,7 @@ class CO6DataDecimal63Order(Base):
     Parent_VarID: Mapped[int] = mapped_column(Integer)
     DateTimeTo: Mapped[datetime.datetime] = mapped_column(DateTime)
     validated: Mapped[bool] = mapped_column(Boolean)
-    val: Mapped[decimal.Decimal] = mapped_column(DECIMAL(9, 3))
+    val: Mapped[float] = mapped_column(DECIMAL(9, 3, asdecimal=False))  # float at the driver boundary
     FlagCurrent: Mapped[int] = mapped_column(Integer)
     Timestamp: Mapped[bytes] = mapped_column(BINARY(8))
     RelatedOrder: Mapped[Optional[int]] = mapped_column(BigInteger)
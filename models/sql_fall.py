@@ -11,7 +11,8 @@ class Fall(Base):
         PrimaryKeyConstraint('ID', name='PK_CO6_Medic_Data_Fall_V'),
         Index('IX_CO6_Medic_Data_Fall_Deleted', 'deleted'),
         Index('IX_CO6_Medic_Data_Fall_ENTL_Deleted_AUFN', 'ENTL', 'deleted', 'AUFN'),
-        Index('IX_CO6_Medic_Data_Fall_FallNr_Deleted', 'FALLNR', 'deleted'),
+        # INCLUDE serves case-number lookups without key lookups into the base table
+        Index('IX_CO6_Medic_Data_Fall_FallNr_Deleted', 'FALLNR', 'deleted', mssql_include=['Patient_ID', 'AUFN', 'ENTL']),
         Index('IX_CO6_Medic_Data_Fall_Timestamp', 'Timestamp'),
         Index('IX_CO6_Medic_Data_Fall_V_Patient_ID_AUFN_ENTL', 'Patient_ID', 'AUFN', 'ENTL')
     )
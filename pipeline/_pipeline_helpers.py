@@ -1,9 +1,32 @@
 # _pipeline_helpers.py
 from __future__ import annotations
+import hashlib
+import json
 import logging
+import os
+import time
+import types
+from collections import OrderedDict
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass, field
+from itertools import islice
+from datetime import date, datetime
 from pathlib import Path
-from typing import Iterable, Mapping, Sequence, Optional, Callable, Dict, NamedTuple
-import pandas as pd
+from types import MappingProxyType
+from typing import (
+    Annotated, Any, Iterable, Iterator, Literal, Mapping, Sequence, Optional, Callable, Dict, Union,
+    get_args, get_origin,
+)
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from pydantic import TypeAdapter, ValidationError
+
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None
 
 log = logging.getLogger(__name__)
 
@@ -12,6 +35,19 @@ def _ensure_parent_dir(path: str) -> None:
     if p.parent and not p.parent.exists():
         p.parent.mkdir(parents=True, exist_ok=True)
 
+def _list_adapter(model_cls) -> TypeAdapter:
+    # one compiled list[model] validator/serializer per schema class, owned by the class
+    return model_cls.list_adapter()
+
+def _row_errors(exc: ValidationError) -> dict[int, list[str]]:
+    """Group a list-validation error by row index -> ["field: message", ...]."""
+    by_row: dict[int, list[str]] = {}
+    for err in exc.errors(include_url=False):
+        idx, *field = err["loc"]
+        where = ".".join(map(str, field)) or "__root__"
+        by_row.setdefault(idx, []).append(f"{where}: {err['msg']}")
+    return by_row
+
 def _validate_with_model(
     rows: Iterable[Mapping],
     model_cls,
@@ -19,21 +55,24 @@ def _validate_with_model(
     hash_salt: Optional[str] = None,
     include: Optional[Iterable[str]] = None,
     exclude: Optional[Iterable[str]] = None,
+    row_offset: int = 0,
 ) -> list[dict]:
-    cleaned: list[dict] = []
+    """
+    Validate and dump all rows in one pass through a cached TypeAdapter(list[model]).
+    Invalid rows are dropped and reported as "row i: ..." warnings; `row_offset`
+    is added to i when `rows` is one chunk of a larger stream.
+    """
+    rows = rows if isinstance(rows, list) else list(rows)
+    adapter = _list_adapter(model_cls)
     errors: list[str] = []
 
-    for i, row in enumerate(rows):
-        try:
-            obj = model_cls.model_validate(row)
-            data = (
-                obj.dump_hashed(salt=hash_salt, include=include, exclude=exclude, log=True)
-                if hash_salt else
-                obj.dump_clean(include=include, exclude=exclude, log=True)
-            )
-            cleaned.append(data)
-        except Exception as exc:
-            errors.append(f"row {i}: {exc}")
+    try:
+        objs = adapter.validate_python(rows)
+    except ValidationError as exc:
+        by_row = _row_errors(exc)
+        errors = [f"row {row_offset + i}: " + "; ".join(msgs) for i, msgs in sorted(by_row.items())]
+        # rows validate independently, so the rest can't fail the second time
+        objs = adapter.validate_python([r for i, r in enumerate(rows) if i not in by_row])
 
     if errors:
         for e in errors[:10]:
@@ -41,36 +80,275 @@ def _validate_with_model(
         if len(errors) > 10:
             log.warning("... plus %d more validation issues", len(errors) - 10)
 
+    # models with plain serialization get a generated dict builder (see BaseSchema)
+    effective_exclude = model_cls._effective_exclude(include=include, exclude=exclude)
+    if getattr(model_cls, "_fast_dump", None) is not None:
+        fast_dump = model_cls._fast_dump_for(effective_exclude)
+        cleaned = [fast_dump(obj, hash_salt) for obj in objs]
+    else:
+        cleaned = adapter.dump_python(
+            objs,
+            exclude_none=True,
+            exclude_unset=True,
+            exclude={"__all__": effective_exclude} if effective_exclude else None,
+            context={"salt": hash_salt} if hash_salt else None,
+        )
+    log.info(
+        "%s validated %d/%d rows; excluded=%s, explicit_include=%s, explicit_exclude=%s, hashing_active=%s",
+        model_cls.__name__, len(objs), len(rows), effective_exclude, include, exclude, bool(hash_salt),
+    )
     return cleaned
 
-def _write_df(df: pd.DataFrame, out: Optional[str], out_format: Optional[str]) -> None:
+# --------- Arrow schema from pydantic annotations ----------------------------
+_ARROW_SCALARS: Dict[Any, pa.DataType] = {
+    str: pa.string(),
+    int: pa.int64(),
+    float: pa.float64(),
+    bool: pa.bool_(),
+    date: pa.date32(),
+    datetime: pa.timestamp("us", tz="Europe/Berlin"),
+}
+_ARROW_SCHEMAS: Dict[type, pa.Schema] = {}
+
+def _arrow_type_for(annotation: Any) -> pa.DataType:
+    """Arrow type for a field annotation; unwraps Optional/Annotated/Literal."""
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return _arrow_type_for(get_args(annotation)[0])
+    if origin in (Union, types.UnionType):
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return _arrow_type_for(args[0])
+    if origin is Literal:
+        kinds = {type(a) for a in get_args(annotation) if a is not None}
+        if len(kinds) == 1:
+            return _arrow_type_for(kinds.pop())
+    arrow_type = _ARROW_SCALARS.get(annotation)
+    if arrow_type is None:
+        raise TypeError(f"No Arrow type for annotation {annotation!r}")
+    return arrow_type
+
+def _arrow_schema_for(schema_cls) -> pa.Schema:
+    """Nullable Arrow schema for all (incl. computed) fields of a pydantic model (cached per class)."""
+    schema = _ARROW_SCHEMAS.get(schema_cls)
+    if schema is None:
+        schema = _ARROW_SCHEMAS[schema_cls] = pa.schema(
+            [pa.field(name, _arrow_type_for(f.annotation)) for name, f in schema_cls.model_fields.items()]
+            + [
+                pa.field(name, _arrow_type_for(c.return_type))
+                for name, c in schema_cls.model_computed_fields.items()
+            ]
+        )
+    return schema
+
+def _chunked(rows: Iterable[Mapping], size: int) -> Iterator[tuple[int, list[Mapping]]]:
+    """Yield (offset, chunk) lists of at most `size` rows."""
+    it = iter(rows)
+    offset = 0
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield offset, chunk
+        offset += len(chunk)
+
+_JSONL_BATCH = 16_384
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+if orjson is not None:
+    def _dumps_jsonl(rows: Iterable[dict]) -> bytes:
+        opt = orjson.OPT_APPEND_NEWLINE
+        return b"".join(orjson.dumps(row, option=opt) for row in rows)
+else:  # pragma: no cover
+    def _dumps_jsonl(rows: Iterable[dict]) -> bytes:
+        return "".join(
+            json.dumps(row, ensure_ascii=False, separators=(",", ":"), default=_json_default) + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+class _JsonlWriter:
+    """
+    Writes tables as JSON lines (dates/datetimes as ISO 8601); same interface as
+    the Arrow writers. Columns are converted per record batch and zipped back
+    into records, then serialized with orjson when available.
+    """
+
+    def __init__(self, path: str, schema: pa.Schema) -> None:
+        self._names = schema.names
+        self._fh = open(path, "wb")
+
+    def write_table(self, table: pa.Table) -> None:
+        names = self._names
+        for batch in table.to_batches(max_chunksize=_JSONL_BATCH):
+            columns = [col.to_pylist() for col in batch.columns]
+            self._fh.write(_dumps_jsonl(dict(zip(names, values)) for values in zip(*columns)))
+
+    def close(self) -> None:
+        self._fh.close()
+
+def _iso_timestamps(col: pa.ChunkedArray) -> pa.ChunkedArray:
+    """
+    Timestamps as `YYYY-MM-DD HH:MM:SS[.ffffff]+HH:MM` strings, i.e. str() of the
+    values as pandas wrote them: fractional seconds only where non-zero.
+    """
+    tz = col.type.tz
+    fmt = "%Y-%m-%d %H:%M:%S%Ez" if tz else "%Y-%m-%d %H:%M:%S"
+    whole = col.cast(pa.timestamp("s", tz=tz), safe=False)
+    return pc.if_else(
+        pc.equal(whole.cast(col.type), col),
+        pc.strftime(whole, format=fmt),
+        pc.strftime(col, format=fmt),
+    )
+
+# one quoting policy per file: every string value quoted, other values bare
+_CSV_OPTIONS = pa_csv.WriteOptions(include_header=False, quoting_style="needed")
+
+class _CsvWriter:
+    """
+    Arrow CSV writer with a stable file format: unquoted header, ISO 8601
+    timestamps (`2025-07-01 10:00:00+02:00`), string values (timestamps
+    included) always quoted, numbers and dates bare, missing values empty.
+    """
+
+    def __init__(self, path: str, schema: pa.Schema) -> None:
+        self._ts = [i for i, f in enumerate(schema) if pa.types.is_timestamp(f.type)]
+        for i in self._ts:
+            schema = schema.set(i, pa.field(schema.field(i).name, pa.string()))
+        self._fh = open(path, "wb")
+        pa_csv.write_csv(schema.empty_table(), self._fh, pa_csv.WriteOptions(quoting_header="none"))
+
+    def write_table(self, table: pa.Table) -> None:
+        for i in self._ts:
+            table = table.set_column(i, table.field(i).name, _iso_timestamps(table.column(i)))
+        pa_csv.write_csv(table, self._fh, _CSV_OPTIONS)
+
+    def close(self) -> None:
+        self._fh.close()
+
+# out_format -> writer factory(path, schema); each has write_table()/close()
+_WRITERS: Dict[str, Callable[[str, pa.Schema], Any]] = {
+    "csv": _CsvWriter,
+    "parquet": pq.ParquetWriter,
+    "pq": pq.ParquetWriter,
+    "jsonl": _JsonlWriter,
+}
+
+@contextmanager
+def _open_writer(out: Optional[str], out_format: Optional[str], schema: pa.Schema):
+    """
+    Yield a writer with `.write_table(table)` for `out` (None if no output is
+    requested), so chunks can be written as they are produced.
+
+    Chunks go to a temporary sibling file that replaces `out` only once the
+    block completes; if it raises, the partial file is removed and an existing
+    `out` is left untouched, so a failed run never looks like a complete one.
+    """
     if not out:
+        yield None
         return
-    _ensure_parent_dir(out)
     fmt = (out_format or (Path(out).suffix.lower().lstrip(".")) or "csv")
-    if fmt == "csv":
-        df.to_csv(out, index=False)
-    elif fmt in {"parquet", "pq"}:
-        df.to_parquet(out, index=False)
-    elif fmt == "jsonl":
-        df.to_json(out, orient="records", lines=True, force_ascii=False)
-    else:
+    factory = _WRITERS.get(fmt)
+    if factory is None:
         raise ValueError(f"Unsupported out format: {fmt}")
-    log.info("Wrote %s (%d rows)", out, len(df))
-
-def _enforce_order(df: pd.DataFrame, requested: Optional[Sequence[str]]) -> pd.DataFrame:
-    """Slice/reshape df to exactly the requested columns in order."""
-    if requested is None:
-        return df
-    cols = [c for c in requested if c in df.columns]
-    if cols:
-        return df.loc[:, cols]
-    # If nothing survived validation, still return the requested schema (empty rows)
-    return pd.DataFrame(columns=list(requested))
-
-class ResourceSpec(NamedTuple):
+    _ensure_parent_dir(out)
+    tmp = f"{out}.{os.getpid()}.partial"
+    writer = factory(tmp, schema)
+    try:
+        yield writer
+        writer.close()
+    except BaseException:
+        with suppress(Exception):
+            writer.close()  # idempotent for all writers in _WRITERS
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    os.replace(tmp, out)
+
+def _enforce_order(table: pa.Table, requested: Sequence[str]) -> pa.Table:
+    """Select exactly the requested columns in order (no data copy)."""
+    names = table.column_names
+    if names == list(requested):
+        return table  # already in order; skip building a new Table
+    present = set(names)
+    return table.select([c for c in requested if c in present])
+
+# --------- in-memory result cache ---------------------------------------------
+class _TTLCache:
+    """Small in-memory LRU whose entries expire `ttl` seconds after being stored."""
+
+    def __init__(self, maxsize: int = 32) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Any) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            self._data.pop(key, None)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Any, value: Any, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+def _digest(parts: Iterable[str]) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+def _result_cache_key(
+    resource: str,
+    by: str,
+    ids: Iterable[Any],
+    fetch_fields: Optional[Sequence[str]],
+    columns: Sequence[str],
+    hash_salt: Optional[str],
+) -> tuple:
+    """Cache key for one run_resource result; IDs and salt enter only as digests."""
+    return (
+        resource,
+        by,
+        _digest(sorted({str(x) for x in ids})),
+        tuple(fetch_fields) if fetch_fields is not None else None,
+        tuple(columns),
+        _digest([hash_salt]) if hash_salt else None,
+    )
+
+@dataclass(frozen=True, slots=True)
+class ResourceSpec:
     schema_cls: type
-    derived_deps: Mapping[str, set[str]]
-    requires_cases: set[str]
+    derived_deps: Mapping[str, frozenset[str]]
+    requires_cases: frozenset[str]
     fetchers: Mapping[str, Callable[..., Iterable[Mapping]]]
-    # fetchers keys may include "cases" and/or "patients"
\ No newline at end of file
+    # fetchers keys may include "cases" and/or "patients"
+    transform: Optional[Callable[[Mapping], Mapping]] = None
+    # per-row post-fetch transform applied before validation
+    default_fields: Mapping[str, Sequence[str]] = field(default_factory=dict)
+    # fields each fetcher returns when called with fields=None, keyed like `fetchers`
+    derived_keys: frozenset[str] = field(init=False, default=frozenset())
+    # names in derived_deps, precomputed for the planner
+
+    def __post_init__(self) -> None:
+        # read-only views so a registered spec can't be mutated in place
+        deps = MappingProxyType({k: frozenset(v) for k, v in self.derived_deps.items()})
+        object.__setattr__(self, "derived_deps", deps)
+        object.__setattr__(self, "requires_cases", frozenset(self.requires_cases))
+        object.__setattr__(self, "fetchers", MappingProxyType(dict(self.fetchers)))
+        object.__setattr__(
+            self, "default_fields", MappingProxyType({k: tuple(v) for k, v in self.default_fields.items()})
+        )
+        object.__setattr__(self, "derived_keys", frozenset(deps))
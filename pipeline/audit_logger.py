@@ -1,20 +1,50 @@
 # _pipeline_helpers.py
 from __future__ import annotations
+import atexit
 import json
-import hashlib
 import time
-from zoneinfo import ZoneInfo
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import IO, Any
 from typing import Iterable, Mapping, Sequence, Optional, Callable, Dict, NamedTuple
 from ._pipeline_helpers import _ensure_parent_dir
-from helpers.hashing import hash_value
+from helpers.datetime_helpers import _BERLIN
+from helpers.hashing import hash_value_many
+
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None
+
+# --------- record serialization ------------------------------------------------
+# orjson (optional) writes UTF-8 bytes incl. the newline in one call and formats
+# datetimes itself; the stdlib fallback produces the same lines.
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+if orjson is not None:
+    def _dumps_line(record: dict) -> bytes:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+else:  # pragma: no cover
+    def _dumps_line(record: dict) -> bytes:
+        return (json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=_json_default) + "\n").encode("utf-8")
+
+def _dumps_text_line(record: dict) -> str:
+    return _dumps_line(record).decode("utf-8")
 
 # --------- AUDIT LOGGER (PHI-safe JSONL) -------------------------------------
+# Records are buffered and flushed every _FLUSH_EVERY records, on the first write
+# after _FLUSH_INTERVAL_S seconds, on flush()/close(), and at interpreter exit.
+_FLUSH_EVERY = 256
+_FLUSH_INTERVAL_S = 1.0
+_FILE_BUFFER = 1 << 20
+
 class AuditLogger:
     """
     Minimal JSONL audit sink for pipeline accesses.
     Writes one JSON object per line. Defaults to PHI-safe summaries.
+    Writes are buffered; call flush() when records must be on disk right away.
     """
 
     def __init__(
@@ -36,27 +66,41 @@ class AuditLogger:
         self.hash_ids = id_hash_salt is not None
         if path:
             _ensure_parent_dir(path)
-            # newline + utf-8 ensures proper jsonl
-            self._fh = open(path, "a", encoding="utf-8", newline="\n")
+            # binary: lines are already UTF-8 with "\n" endings
+            self._fh = open(path, "ab", buffering=_FILE_BUFFER)
+            self._dumps = _dumps_line
         else:
             self._fh = stream  # assumed text mode
+            self._dumps = _dumps_text_line
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._closed = False
+        atexit.register(self.close)
+
+    def flush(self) -> None:
+        if self._pending and self._fh:
+            self._fh.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
 
     def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
         try:
+            self.flush()
             if self._path and self._fh:
                 self._fh.close()
         except Exception:
             pass
 
-    def _hash_id(self, s: str) -> str:
-        return hash_value(s, salt=self.id_hash_salt)
-
     def _summarize_ids(self, ids: Sequence[str]) -> dict[str, Any]:
         summary: dict[str, Any] = {"count": len(ids)}
         if self.include_id_samples and ids:
             sample = list(ids[: self.id_sample_size])
             if self.hash_ids:
-                summary["hashed_ids"] = [self._hash_id(x) for x in sample]
+                summary["hashed_ids"] = hash_value_many(sample, salt=self.id_hash_salt)
             else:
                 summary["ids"] = sample
         return summary
@@ -81,7 +125,7 @@ class AuditLogger:
         extra: Optional[dict[str, Any]] = None,
     ) -> None:
         record = {
-            "ts": datetime.now(ZoneInfo("Europe/Berlin")).isoformat(),
+            "ts": datetime.now(_BERLIN),  # formatted by the serializer
             "actor": actor,
             "action": action,
             "resource": resource,
@@ -99,9 +143,10 @@ class AuditLogger:
         }
         if extra:
             record["extra"] = extra
-        self._fh.write(json.dumps(record, ensure_ascii=False))
-        self._fh.write("\n")
-        self._fh.flush()
+        self._fh.write(self._dumps(record))
+        self._pending += 1
+        if self._pending >= _FLUSH_EVERY or time.monotonic() - self._last_flush > _FLUSH_INTERVAL_S:
+            self.flush()
 
 
 def timeit() -> tuple[callable, callable]:
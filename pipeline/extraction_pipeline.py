@@ -5,15 +5,39 @@ from pathlib import Path
 from typing import Iterable, Mapping, Sequence, Optional, Callable, Dict, NamedTuple
 
 import pandas as pd
+import pyarrow as pa
 
 # Flat imports to match your project layout
 from connection.fetcher import make_fetcher
-from ._pipeline_helpers import _ensure_parent_dir, _validate_with_model, _write_df, _enforce_order, ResourceSpec
+from ._pipeline_helpers import (
+    _TTLCache,
+    _arrow_schema_for,
+    _chunked,
+    _enforce_order,
+    _ensure_parent_dir,
+    _open_writer,
+    _result_cache_key,
+    _validate_with_model,
+    ResourceSpec,
+)
 from .audit_logger import AuditLogger, timeit
 
+log = logging.getLogger(__name__)
+
 # ---------- public API (registry-based) ----------
 from .pipes.extract_demography import DEMOGRAPHICS_SPEC
 
+# rows fetched, validated and written per step
+CHUNK = 10_000
+
+# Opt-in (cache_ttl=...) results of recent run_resource calls. In memory only:
+# the tables hold PHI, so nothing is ever persisted to disk.
+_RESULT_CACHE = _TTLCache(maxsize=32)
+
+def clear_result_cache() -> None:
+    """Drop all cached run_resource results (e.g. after the source data changed)."""
+    _RESULT_CACHE.clear()
+
 REGISTRY: Dict[str, ResourceSpec] = {
     "demographics": DEMOGRAPHICS_SPEC,
 }
@@ -34,22 +58,35 @@ def _plan_fetch_and_include_for(
         return None, None
 
     requested = list(dict.fromkeys(requested))  # de-dupe but keep order
-    req_set = set(requested)
 
     # some fields/derivations only make sense when by='cases'
-    if by != "cases" and (spec.requires_cases & req_set):
+    if by != "cases" and not spec.requires_cases.isdisjoint(requested):
         raise ValueError("Requested fields require by='cases' for this resource.")
 
-    # start with non-derived
-    fetch_fields = [f for f in requested if f not in spec.derived_deps]
-    # append deps in stable order
-    for name in requested:
-        for dep in spec.derived_deps.get(name, ()):
-            if dep not in fetch_fields:
-                fetch_fields.append(dep)
+    # non-derived first, then deps in stable order (dict.fromkeys de-dupes in order)
+    derived_keys = spec.derived_keys
+    deps = spec.derived_deps
+    fetch_fields = list(dict.fromkeys(
+        [f for f in requested if f not in derived_keys]
+        + [dep for f in requested if f in derived_keys for dep in deps[f]]
+    ))
 
     return fetch_fields, requested
 
+def _default_columns_for(spec: ResourceSpec, by: str, names: Sequence[str]) -> list[str]:
+    """
+    Output columns when no fields were requested: what the fetcher returns by
+    default plus the derived fields computable from it, in schema order and
+    without the schema's excluded_by_default.
+    """
+    excluded = spec.schema_cls.excluded_by_default
+    defaults = spec.default_fields.get(by)
+    if defaults is None:  # fetcher defaults unknown -> every schema column
+        return [n for n in names if n not in excluded]
+    available = set(defaults)
+    available.update(k for k, deps in spec.derived_deps.items() if deps <= available)
+    return [n for n in names if n in available and n not in excluded]
+
 def run_resource(
     resource: str,
     *,
@@ -61,7 +98,16 @@ def run_resource(
     out_format: Optional[str] = None,
     audit: Optional[AuditLogger] = None,
     actor: Optional[str] = None,
+    cache_ttl: Optional[float] = None,
+    cache_bypass: bool = False,
 ) -> pd.DataFrame:
+    """
+    Fetch, validate and (optionally) write one resource.
+
+    With `cache_ttl` (seconds) the validated table is kept in memory and an
+    identical call (same resource/by/IDs/fields/salt) within the TTL skips the
+    database; `cache_bypass=True` forces a fresh fetch and refreshes the entry.
+    """
     if resource not in REGISTRY:
         raise ValueError(f"Unknown resource: {resource}")
     if by not in {"cases", "patients"}:
@@ -75,31 +121,62 @@ def run_resource(
         fetch_func = spec.fetchers.get("cases")
         if not fetch_func:
             raise ValueError(f"Resource '{resource}' does not support by='cases'.")
-        params = {"case_numbers": ids, "fields": fetch_fields}
+        params = {"case_numbers": ids, "fields": fetch_fields, "stream": True}
     else:
         fetch_func = spec.fetchers.get("patients")
         if not fetch_func:
             raise ValueError(f"Resource '{resource}' does not support by='patients'.")
-        params = {"patient_ids": ids, "fields": fetch_fields}
+        params = {"patient_ids": ids, "fields": fetch_fields, "stream": True}
 
     start, stop = timeit()
     start()
 
-    # Fetch → validate
-    fetcher = make_fetcher(fetch_func)
-    rows = list(fetcher.iter(**params))
-
-    cleaned = _validate_with_model(
-        rows,
-        spec.schema_cls,
-        hash_salt=hash_salt,
-        include=set(include_fields) if include_fields is not None else None,
-        exclude=None,
-    )
-
-    df = pd.DataFrame(cleaned)
-    df = _enforce_order(df, include_fields)
-    _write_df(df, out, out_format)
+    # Columnar build against a fixed schema: every requested (or default) column
+    # is present with its declared type, even when all values are null.
+    schema = _arrow_schema_for(spec.schema_cls)
+    columns = include_fields
+    if columns is None:
+        columns = _default_columns_for(spec, by, schema.names)
+    out_schema = _enforce_order(schema.empty_table(), columns).schema
+    include = set(include_fields) if include_fields is not None else None
+
+    cache_key = None
+    if cache_ttl is not None:
+        cache_key = _result_cache_key(resource, by, ids, fetch_fields, columns, hash_salt)
+    cached = _RESULT_CACHE.get(cache_key) if cache_key is not None and not cache_bypass else None
+
+    if cached is not None:
+        table = cached
+        with _open_writer(out, out_format, out_schema) as writer:
+            if writer is not None:
+                writer.write_table(table)
+    else:
+        # Fetch → validate → write, one chunk at a time (fetcher.iter consumes the
+        # stream inside its session); only the columnar result is kept for the return.
+        fetcher = make_fetcher(fetch_func, transform=spec.transform)
+        tables: list[pa.Table] = []
+        with _open_writer(out, out_format, out_schema) as writer:
+            for offset, chunk in _chunked(fetcher.iter(**params), CHUNK):
+                cleaned = _validate_with_model(
+                    chunk,
+                    spec.schema_cls,
+                    hash_salt=hash_salt,
+                    include=include,
+                    exclude=None,
+                    row_offset=offset,
+                )
+                table = _enforce_order(pa.Table.from_pylist(cleaned, schema=schema), columns)
+                if writer is not None:
+                    writer.write_table(table)
+                tables.append(table)
+
+        table = pa.concat_tables(tables) if tables else out_schema.empty_table()
+        if cache_key is not None:
+            _RESULT_CACHE.put(cache_key, table, cache_ttl)
+
+    if out:
+        log.info("Wrote %s (%d rows)", out, table.num_rows)
+    df = table.to_pandas(types_mapper=pd.ArrowDtype)
 
     elapsed = stop()
 
@@ -123,6 +200,7 @@ def run_resource(
             out_format=out_format,
             rows=len(df),
             duration_ms=elapsed,
+            extra={"cache_hit": True} if cached is not None else None,
         )
 
     return df
@@ -139,6 +217,8 @@ def run_demographics(
     out_format: Optional[str] = None,
     audit: Optional[AuditLogger] = None,
     actor: Optional[str] = None,
+    cache_ttl: Optional[float] = None,
+    cache_bypass: bool = False,
 ) -> pd.DataFrame:
     return run_resource(
         "demographics",
@@ -150,4 +230,6 @@ def run_demographics(
         out_format=out_format,
         audit=audit,
         actor=actor,
+        cache_ttl=cache_ttl,
+        cache_bypass=cache_bypass,
     )
\ No newline at end of file
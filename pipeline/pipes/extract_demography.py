@@ -1,5 +1,7 @@
 from pipeline._pipeline_helpers import ResourceSpec
 from methods.fetch_demographics import (
+    _DEFAULT_CASES_FIELDS,
+    _DEFAULT_PATIENTS_FIELDS,
     fetch_demography_for_cases,
     fetch_demography_for_patients,
 )
@@ -8,12 +10,16 @@ from schemas.demographics import DemographicsOut
 DEMOGRAPHICS_SPEC = ResourceSpec(
     schema_cls=DemographicsOut,
     derived_deps={
-        "patient_age_today": {"patient_date_of_birth"},
-        "patient_age_at_admission": {"patient_date_of_birth", "case_admission_time"},
+        "patient_age_today": frozenset({"patient_date_of_birth"}),
+        "patient_age_at_admission": frozenset({"patient_date_of_birth", "case_admission_time"}),
     },
-    requires_cases={"case_number", "case_admission_time", "case_discharge_time", "patient_age_at_admission"},
+    requires_cases=frozenset({"case_number", "case_admission_time", "case_discharge_time", "patient_age_at_admission"}),
     fetchers={
         "cases": fetch_demography_for_cases,
         "patients": fetch_demography_for_patients,
     },
+    default_fields={
+        "cases": _DEFAULT_CASES_FIELDS,
+        "patients": _DEFAULT_PATIENTS_FIELDS,
+    },
 )
\ No newline at end of file
@@ -1,9 +1,9 @@
 from __future__ import annotations
-from typing import Any, ClassVar, Iterable, Optional, Mapping
+from typing import AbstractSet, Any, Callable, ClassVar, Iterable, Optional, Mapping, get_args
 import logging
 
-from pydantic import BaseModel, ConfigDict, model_serializer, model_validator
-from helpers.hashing import hash_value
+from pydantic import BaseModel, ConfigDict, TypeAdapter, field_validator, model_serializer
+from helpers.hashing import make_hasher
 
 class BaseSchema(BaseModel):
     """
@@ -18,7 +18,7 @@ class BaseSchema(BaseModel):
 
     Usage (per model):
         class DemographicsOut(BaseSchema):
-            hashable_fields = {"case_number", "patient_id"}
+            hashable_fields = frozenset({"case_number", "patient_id"})
             ...
 
         m.dump_hashed(salt="secret")  # will hash those fields if present
@@ -32,10 +32,10 @@ class BaseSchema(BaseModel):
     )
 
     # Names of fields that should be hashed when a salt is provided at dump time
-    hashable_fields: ClassVar[set[str]] = set()
+    hashable_fields: ClassVar[AbstractSet[str]] = frozenset()
 
     # Names of fields a model wants excluded by default
-    excluded_by_default: ClassVar[set[str]] = set()
+    excluded_by_default: ClassVar[AbstractSet[str]] = frozenset()
 
     # Optional per-model normalization maps. Subclasses can define mappings like:
     # normalization_maps = {
@@ -43,6 +43,93 @@ class BaseSchema(BaseModel):
     # }
     normalization_maps: ClassVar[dict[str, dict[str, Any]]] = {}
 
+    # Per-class caches of the settings above, rebuilt for each subclass (subclasses
+    # may still declare the sets above as plain set literals)
+    _excluded_by_default_frozen: ClassVar[frozenset[str]] = frozenset()
+    _hashable_fields_tuple: ClassVar[tuple[str, ...]] = ()
+    _folded_maps: ClassVar[dict[str, dict[str, Any]]] = {}
+    _map_defaults: ClassVar[dict[str, Any]] = {}
+    # per field: the normalizer closure over its folded map (also the before-validator)
+    _normalizers: ClassVar[dict[str, Callable[[Any], Any]]] = {}
+    # generated dict builder for the default dumps (None if the model isn't eligible)
+    _fast_dump: ClassVar[Optional[Callable[..., dict[str, Any]]]] = None
+    # generated builders per effective exclusion set (see _fast_dump_for)
+    _fast_dumps: ClassVar[dict[frozenset[str], Callable[..., dict[str, Any]]]] = {}
+    _dump_names: ClassVar[frozenset[str]] = frozenset()
+    # TypeAdapter(list[cls]), built on first use by list_adapter()
+    _list_adapter: ClassVar[Optional[TypeAdapter]] = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Fold `normalization_maps` once and attach one before-validator per field.
+
+        Runs before pydantic collects the class's validators, so the generated
+        validators are picked up like hand-written `@field_validator`s. Each one
+        is a plain function bound to its field's map, so fields are stored in
+        canonical form at validation time and dumps never re-normalize.
+        """
+        super().__init_subclass__(**kwargs)
+        maps = cls.__dict__.get("normalization_maps")
+        if maps is None:
+            return  # inherit the parent's folded maps and validators
+        cls._folded_maps = {
+            field: {str(k).strip().casefold(): v for k, v in mapping.items() if k != "__default__"}
+            for field, mapping in maps.items()
+        }
+        cls._map_defaults = {
+            field: mapping["__default__"] for field, mapping in maps.items() if "__default__" in mapping
+        }
+        cls._normalizers = {
+            field: _compile_normalizer(folded, cls._map_defaults.get(field, _KEEP))
+            for field, folded in cls._folded_maps.items()
+        }
+        for field, fn in cls._normalizers.items():
+            setattr(cls, f"_normalize_{field}", field_validator(field, mode="before")(staticmethod(fn)))
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        cls._excluded_by_default_frozen = frozenset(cls.excluded_by_default)
+        cls._hashable_fields_tuple = tuple(cls.hashable_fields)
+        cls._fast_dumps = {}
+        cls._dump_names = frozenset(cls.model_fields) | frozenset(cls.model_computed_fields)
+        cls._fast_dump = cls._fast_dump_for(cls._excluded_by_default_frozen) if _plain_serialization(cls) else None
+
+    @classmethod
+    def _fast_dump_for(cls, excluded: AbstractSet[str]) -> Callable[..., dict[str, Any]]:
+        """
+        Generated `(self, salt=None) -> dict` builder emitting every field not in
+        `excluded`, cached per class and exclusion set. Only valid for models
+        with a `_fast_dump` (plain serialization).
+        """
+        key = cls._dump_names.intersection(excluded)  # unknown names don't split the cache
+        fn = cls._fast_dumps.get(key)
+        if fn is None:
+            fn = cls._fast_dumps[key] = _compile_fast_dump(cls, key)
+        return fn
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]):
+        """
+        Build an instance from a trusted, already-typed row (e.g. a DB mapping)
+        without validation: `normalization_maps` are applied, everything else
+        is taken as is via model_construct(). Use the validating constructors
+        for anything that may be malformed.
+        """
+        data = dict(row)
+        for field, normalize in cls._normalizers.items():
+            if field in data:
+                data[field] = normalize(data[field])
+        return cls.model_construct(**data)
+
+    @classmethod
+    def list_adapter(cls) -> TypeAdapter:
+        """Cached `TypeAdapter(list[cls])` for validating/dumping whole batches of rows in one call."""
+        adapter = cls.__dict__.get("_list_adapter")
+        if adapter is None:
+            adapter = TypeAdapter(list[cls])
+            cls._list_adapter = adapter
+        return adapter
+
     @classmethod
     def _normalize_value(cls, field: str, value: Any) -> Any:
         """Normalize a single field using the subclass-provided mapping.
@@ -50,42 +137,52 @@ class BaseSchema(BaseModel):
         - If value is None or empty string -> returns None.
         - If key not found -> returns mapping.get("__default__", original value).
         """
-        mapping = cls.normalization_maps.get(field)
-        if mapping is None:
-            return value
-        if value is None:
-            return None
-        if isinstance(value, str) and value.strip() == "":
-            return None
-        # Build a casefolded lookup to handle i18n (e.g., "Männlich") robustly
-        folded_map = {str(k).strip().casefold(): v for k, v in mapping.items() if k != "__default__"}
-        key = str(value).strip().casefold()
-        if key in folded_map:
-            return folded_map[key]
-        return mapping.get("__default__", value)
-
-    @model_validator(mode="before")
+        normalize = cls._normalizers.get(field)
+        return value if normalize is None else normalize(value)
+
     @classmethod
-    def _apply_normalization_maps(cls, data: Any) -> Any:
-        """Apply `normalization_maps` to incoming data before validation.
-        Supports dict-style inputs and returns data unchanged for other types.
+    def normalize_table(cls, table):
+        """Apply `normalization_maps` column-wise to a `pyarrow.Table`.
+
+        For Arrow data that bypasses validation (e.g. `Fetcher.to_arrow()`):
+        same rules as `_normalize_value`, evaluated with `pyarrow.compute` over
+        whole string columns. Keys are matched lower-cased (`utf8_lower`), which
+        equals casefold() for the map keys in use. Requires `pyarrow`.
         """
-        if not isinstance(data, dict) or not getattr(cls, "normalization_maps", None):
-            return data
-        new_data = dict(data)
-        for field in cls.normalization_maps.keys():
-            if field in new_data:
-                new_data[field] = cls._normalize_value(field, new_data[field])
-        return new_data
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        for field, folded_map in cls._folded_maps.items():
+            if field not in table.column_names:
+                continue
+            col = table.column(field)
+            if not (pa.types.is_string(col.type) or pa.types.is_large_string(col.type)):
+                continue
+            key = pc.utf8_lower(pc.utf8_trim_whitespace(col))
+            idx = pc.index_in(key, value_set=pa.array(list(folded_map), type=col.type))
+            mapped = pc.take(pa.array(list(folded_map.values()), type=col.type), idx)
+            fallback = (
+                pa.scalar(cls._map_defaults[field], type=col.type)
+                if field in cls._map_defaults
+                else col
+            )
+            out = pc.if_else(pc.is_valid(idx), mapped, fallback)
+            # blank strings -> null (nulls stay null: a null condition yields null)
+            out = pc.if_else(pc.equal(pc.utf8_length(key), 0), pa.scalar(None, type=col.type), out)
+            table = table.set_column(table.schema.get_field_index(field), field, out)
+        return table
 
+    @classmethod
     def _effective_exclude(
-        self,
+        cls,
         include: Optional[Iterable[str]] = None,
         exclude: Optional[Iterable[str]] = None,
-    ) -> set[str]:
+    ) -> AbstractSet[str]:
+        if not include and not exclude:
+            return cls._excluded_by_default_frozen
         exclude_set = set(exclude) if exclude else set()
         include_set = set(include) if include else set()
-        effective = (self.excluded_by_default | exclude_set) - include_set
+        effective = (cls._excluded_by_default_frozen | exclude_set) - include_set
         return effective
 
     # ---------------- convenience dumps ----------------
@@ -99,13 +196,19 @@ class BaseSchema(BaseModel):
         **kwargs,
     ) -> dict[str, Any]:
         """Return a dict with None/unset removed. Extra kwargs go to model_dump()."""
-        effective_exclude = self._effective_exclude(include=include, exclude=exclude)
-        result = self.model_dump(
-            exclude_none=True,
-            exclude_unset=True,
-            exclude=effective_exclude,
-            **kwargs,
-        )
+        if not kwargs and self._fast_dump is not None:
+            if not include and not exclude:
+                result = self._fast_dump()
+            else:
+                result = self._fast_dump_for(self._effective_exclude(include=include, exclude=exclude))(self)
+        else:
+            effective_exclude = self._effective_exclude(include=include, exclude=exclude)
+            result = self.model_dump(
+                exclude_none=True,
+                exclude_unset=True,
+                exclude=effective_exclude,
+                **kwargs,
+            )
         if log:
             log = logger or logging.getLogger(__name__)
             log.info(
@@ -130,16 +233,22 @@ class BaseSchema(BaseModel):
         Like dump_clean(), but passes a salt via context so fields listed in
         `hashable_fields` are hashed by the serializer below.
         """
-        effective_exclude = self._effective_exclude(include=include, exclude=exclude)
         context = (kwargs.pop("context", None) or {})
-        context = {**context, "salt": salt}
-        result = self.model_dump(
-            exclude_none=True,
-            exclude_unset=True,
-            exclude=effective_exclude,
-            context=context,
-            **kwargs,
-        )
+        if not kwargs and self._fast_dump is not None:
+            if not include and not exclude:
+                result = self._fast_dump(salt)
+            else:
+                result = self._fast_dump_for(self._effective_exclude(include=include, exclude=exclude))(self, salt)
+        else:
+            effective_exclude = self._effective_exclude(include=include, exclude=exclude)
+            context = {**context, "salt": salt}
+            result = self.model_dump(
+                exclude_none=True,
+                exclude_unset=True,
+                exclude=effective_exclude,
+                context=context,
+                **kwargs,
+            )
         if log:
             log = logger or logging.getLogger(__name__)
             log.info(
@@ -213,11 +322,121 @@ class BaseSchema(BaseModel):
     def _apply_hashing(self, handler, info):
         data = handler(self)
         salt = (info.context or {}).get("salt")
-        if not salt or not self.hashable_fields:
+        fields = self._hashable_fields_tuple
+        if not salt or not fields:
             return data
+        hasher = make_hasher(salt)  # cached per salt; same digest as hash_value()
         # Only hash present string fields listed in hashable_fields
-        for field in self.hashable_fields:
-            val = data.get(field)
-            if isinstance(val, str):
-                data[field] = hash_value(val, salt=salt)
-        return data
\ No newline at end of file
+        for field in fields:
+            if field in data:
+                val = data[field]
+                if isinstance(val, str):
+                    data[field] = hasher(val)
+        return data
+
+
+# marks a map without "__default__": unmatched values are kept as given
+_KEEP = object()
+
+
+def _compile_normalizer(folded_map: Mapping[str, Any], default: Any) -> Callable[[Any], Any]:
+    """Normalizer for one `normalization_maps` entry (see BaseSchema._normalize_value)."""
+    table = _ascii_table(folded_map)
+
+    def _normalize(value: Any) -> Any:
+        if value is None:
+            return None
+        # hot path: single-character codes ("m", "W", ...) via a table lookup
+        if type(value) is str and len(value) == 1 and value < "\x80":
+            hit = table[ord(value)]
+            if hit is not None:
+                return hit
+        key = value.strip() if isinstance(value, str) else str(value).strip()
+        if not key and isinstance(value, str):
+            return None
+        hit = folded_map.get(key.casefold(), _KEEP)
+        if hit is not _KEEP:
+            return hit
+        return value if default is _KEEP else default
+
+    return _normalize
+
+
+def _ascii_table(folded_map: Mapping[str, Any]) -> tuple[Any, ...]:
+    """Index single ASCII-character keys of a folded map by code point, both cases."""
+    table: list[Any] = [None] * 128
+    for key, value in folded_map.items():
+        if len(key) == 1 and key < "\x80":
+            table[ord(key)] = table[ord(key.upper())] = value
+    return tuple(table)
+
+
+def _contains_model(annotation: Any) -> bool:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return True
+    return any(_contains_model(arg) for arg in get_args(annotation))
+
+
+def _plain_serialization(cls) -> bool:
+    """
+    True if model_dump() of `cls` only copies field values and computed-field
+    results: no aliases, nested models, field serializers, or model serializers
+    besides the hashing hook. Such models can use a generated `_fast_dump`.
+    """
+    decorators = cls.__pydantic_decorators__
+    return (
+        not decorators.field_serializers
+        and set(decorators.model_serializers) <= {"_apply_hashing"}
+        and all(
+            f.alias is None and f.serialization_alias is None and not _contains_model(f.annotation)
+            for f in cls.model_fields.values()
+        )
+        and all(
+            c.alias is None and not _contains_model(c.return_type)
+            for c in cls.model_computed_fields.values()
+        )
+    )
+
+
+def _compile_fast_dump(cls, excluded: AbstractSet[str]) -> Callable[..., dict[str, Any]]:
+    """
+    Generate `_fast_dump(self, salt=None)`, equivalent to dump_clean()/
+    dump_hashed(salt=...) with `excluded` as the effective exclusion set
+    (exclude_none, exclude_unset, hashable_fields hashed when salted), with the
+    emitted field names and hashing unrolled so no schema or set is consulted
+    per call. Fields declared with `Field(exclude=True)` are never emitted, as
+    in model_dump().
+    """
+    excluded = set(excluded).union(name for name, f in cls.model_fields.items() if f.exclude)
+    hashable = set(cls._hashable_fields_tuple)
+    lines = [
+        "def _fast_dump(self, salt=None):",
+        "    d = self.__dict__",
+        "    fs = self.__pydantic_fields_set__",
+        "    h = make_hasher(salt) if salt else None",
+        "    out = {}",
+    ]
+    for name in cls.model_fields:
+        if name in excluded:
+            continue
+        lines.append(f"    v = d[{name!r}]")
+        lines.append(f"    if v is not None and {name!r} in fs:")
+        if name in hashable:
+            lines.append(f"        out[{name!r}] = h(v) if h is not None and isinstance(v, str) else v")
+        else:
+            lines.append(f"        out[{name!r}] = v")
+    # computed fields follow the declared ones, as in model_dump(); excluded ones
+    # are never evaluated
+    for name in cls.model_computed_fields:
+        if name in excluded:
+            continue
+        lines.append(f"    v = self.{name}")
+        lines.append("    if v is not None:")
+        if name in hashable:
+            lines.append(f"        out[{name!r}] = h(v) if h is not None and isinstance(v, str) else v")
+        else:
+            lines.append(f"        out[{name!r}] = v")
+    lines.append("    return out")
+    namespace: dict[str, Any] = {"make_hasher": make_hasher}
+    exec("\n".join(lines), namespace)
+    return namespace["_fast_dump"]
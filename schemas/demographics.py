@@ -1,32 +1,36 @@
 # schemas/demographics.py
 from __future__ import annotations
 from datetime import date, datetime
-from pydantic import Field, model_validator
+from typing import Literal
+from types import MappingProxyType
+from functools import cached_property
+from pydantic import Field, computed_field
 from .base_schema_out import BaseSchema
 from helpers.datetime_helpers import _age
 
+# shared, read-only; folded once by BaseSchema.__init_subclass__
+_SEX_MAP = MappingProxyType({
+    # Male
+    "m": "M", "male": "M", "männlich": "M",
+    # Female
+    "f": "F", "female": "F", "w": "F", "weiblich": "F",
+    # Diverse
+    "d": "D", "divers": "D",
+    # Unknown
+    "u": "U", "unknown": "U",
+    # Fallback for anything not matched above
+    "__default__": "U",
+})
+
 class DemographicsOut(BaseSchema):
-    hashable_fields = {"case_number"}
-    excluded_by_default = {"patient_date_of_birth"}
-    normalization_maps = {
-        "patient_sex": {
-            # Male
-            "m": "M", "male": "M", "männlich": "M",
-            # Female
-            "f": "F", "female": "F", "w": "F", "weiblich": "F",
-            # Diverse
-            "d": "D", "divers": "D",
-            # Unknown
-            "u": "U", "unknown": "U",
-            # Fallback for anything not matched above
-            "__default__": "U",
-        }
-    }
+    hashable_fields = frozenset({"case_number"})
+    excluded_by_default = frozenset({"patient_date_of_birth"})
+    normalization_maps = {"patient_sex": _SEX_MAP}
 
     case_number: str
 
     # patient fields
-    patient_sex: str | None = None
+    patient_sex: Literal["M", "F", "D", "U"] | None = None  # after normalization_maps
     patient_date_of_birth: date | None = Field(default=None)
     patient_body_weight: float | None = None
     patient_body_height: float | None = None
@@ -35,17 +39,29 @@ class DemographicsOut(BaseSchema):
     case_admission_time: datetime | None = Field(default=None) #exclude=True
     case_discharge_time: datetime | None = Field(default=None) #exclude=True
 
-    # derived
-    patient_age_today: int | None = None
-    patient_age_at_admission: int | None = None
+    # derived (computed on first access; skipped entirely when excluded from a dump)
+    @computed_field(return_type=int | None)
+    @cached_property
+    def patient_age_today(self):
+        dob = self.patient_date_of_birth
+        return _age(dob) if dob else None
 
-    @model_validator(mode="after")
-    def _compute_ages(self) -> "DemographicsOut":
+    @computed_field(return_type=int | None)
+    @cached_property
+    def patient_age_at_admission(self):
         dob = self.patient_date_of_birth
         if not dob:
-            return self
-        if self.patient_age_today is None:
-            self.patient_age_today = _age(dob)
-        if self.case_admission_time and self.patient_age_at_admission is None:
-            self.patient_age_at_admission = _age(dob, self.case_admission_time.date())
-        return self
\ No newline at end of file
+            return None
+        admission = self._admission_date
+        # no admission, or dirty data with birth after admission -> no age
+        return _age(dob, admission) if admission and dob <= admission else None
+
+    @cached_property
+    def _admission_date(self) -> date | None:
+        """Local calendar day of admission, converted once per instance for all consumers."""
+        t = self.case_admission_time
+        return t.date() if t else None
+
+
+# batch validator/serializer: DEMOGRAPHICS_LIST_ADAPTER.validate_python(rows)
+DEMOGRAPHICS_LIST_ADAPTER = DemographicsOut.list_adapter()
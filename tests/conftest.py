@@ -3,7 +3,7 @@ import pytest
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-from connection.session import get_engine, get_session
+from connection.session import get_engine, get_sessionmaker
 
 # ---------- Engine / Session fixtures ----------
 
@@ -12,30 +12,54 @@ def engine():
     """Process-wide engine (your code already enforces singleton; this just reuses it)."""
     return get_engine()
 
+@pytest.fixture(scope="session")
+def db_connection(engine):
+    """One connection for the whole run, inside an outer transaction that is rolled back at the end."""
+    with engine.connect() as conn:
+        outer = conn.begin()
+        yield conn
+        outer.rollback()
+
 @pytest.fixture(scope="function")
-def db_session() -> Session:
-    """Fresh SQLAlchemy session per test (transactionless by default)."""
-    with get_session() as session:
+def db_session(db_connection) -> Session:
+    """
+    Per-test session on the shared connection. Its work runs in a SAVEPOINT that
+    is rolled back on close, so tests stay isolated without reconnecting.
+    """
+    session = get_sessionmaker()(bind=db_connection, join_transaction_mode="create_savepoint")
+    try:
         yield session
+    finally:
+        session.close()
 
 # ---------- helpers / import in tests ----------
 
+# built once; the statement (and its compiled form in the engine's cache) is reused by every smoke test
+_SELECT_1 = text("SELECT 1")
+
 def select_1(executor) -> int:
     """
     Run SELECT 1 against either a Session or a Connection.
     """
-    return executor.execute(text("SELECT 1")).scalar()
+    return executor.execute(_SELECT_1).scalar()
 
-def tx_active(sess: Session) -> bool:
-    """
-    Robustly detect if a Session has an active transaction across SQLAlchemy versions.
-    Prefers get_transaction() when available; falls back to in_transaction / in_transaction().
-    """
-    if hasattr(sess, "get_transaction"):
-        tx = sess.get_transaction()
-        return bool(tx and tx.is_active)
-    if hasattr(sess, "in_transaction") and callable(getattr(sess, "in_transaction")):
-        return bool(sess.in_transaction())
-    if hasattr(sess, "in_transaction"):  # SQLA 2.x attr (property-like)
-        return bool(sess.in_transaction)
-    return False
\ No newline at end of file
+def _tx_active_get_transaction(sess: Session) -> bool:
+    tx = sess.get_transaction()
+    return bool(tx and tx.is_active)
+
+def _tx_active_method(sess: Session) -> bool:
+    return bool(sess.in_transaction())
+
+def _tx_active_attr(sess: Session) -> bool:
+    return bool(getattr(sess, "in_transaction", False))
+
+# Detect if a Session has an active transaction. The API differs across SQLAlchemy
+# versions but is fixed for the installed one, so probe the Session class once here
+# and bind the matching implementation: get_transaction() when available, else
+# in_transaction() / the in_transaction attribute.
+if hasattr(Session, "get_transaction"):
+    tx_active = _tx_active_get_transaction
+elif callable(getattr(Session, "in_transaction", None)):
+    tx_active = _tx_active_method
+else:
+    tx_active = _tx_active_attr
@@ -0,0 +1,28 @@
+# tests/helpers/test_datetime_helpers.py
+from datetime import date
+
+import pandas as pd
+
+from helpers.datetime_helpers import _age, _age_series
+
+def test_age_defaults_to_today_at_call_time():
+    today = date.today()
+    dob = date(today.year - 30, 1, 1)
+    assert _age(dob) == _age(dob, today)
+
+def test_age_series_matches_scalar_age():
+    ref = date(2025, 10, 1)
+    dobs = [date(1992, 12, 13), date(1992, 10, 1), date(1992, 10, 2), date(2000, 2, 29), None]
+    ages = _age_series(pd.Series(dobs), ref)
+    expected = [_age(d, ref) for d in dobs[:-1]]
+    assert ages[:-1].tolist() == expected
+    assert ages.isna().iloc[-1]
+
+def test_utc_to_berlin_is_dst_aware():
+    from datetime import datetime, timezone
+    from helpers.datetime_helpers import _utc_to_berlin
+
+    summer = _utc_to_berlin(datetime(2025, 7, 1, 8, 0))
+    winter = _utc_to_berlin(datetime(2025, 1, 1, 8, 0, tzinfo=timezone.utc))
+    assert summer.isoformat() == "2025-07-01T10:00:00+02:00"
+    assert winter.isoformat() == "2025-01-01T09:00:00+01:00"
@@ -0,0 +1,28 @@
+# tests/helpers/test_hashing.py
+import pytest
+
+from helpers.hashing import hash_value, hash_value_many, make_hasher
+
+@pytest.mark.parametrize("length", [12, 11, 64])
+def test_make_hasher_matches_hash_value(length):
+    h = make_hasher("secret", length=length)
+    for v in ["007", "123456", "Müller"]:
+        assert h(v) == hash_value(v, salt="secret", length=length)
+
+@pytest.mark.parametrize("salt", [None, ""])
+def test_make_hasher_without_salt_is_identity(salt):
+    assert make_hasher(salt)("007") == "007"
+
+def test_make_hasher_is_cached_per_salt():
+    assert make_hasher("secret") is make_hasher("secret")
+    assert make_hasher("secret") is not make_hasher("other")
+
+def test_hash_value_many_matches_hash_value():
+    values = ["007", "123456"]
+    assert hash_value_many(values, salt="secret") == [hash_value(v, salt="secret") for v in values]
+
+def test_hash_value_accepts_salts_longer_than_blake2b_key():
+    salt = "s" * 100
+    assert len(hash_value("007", salt=salt)) == 12
+    assert hash_value("007", salt=salt) != hash_value("007", salt=salt[:64])
+    assert make_hasher(salt)("007") == hash_value("007", salt=salt)
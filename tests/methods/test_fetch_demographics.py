@@ -0,0 +1,28 @@
+# tests/methods/test_fetch_demographics.py
+import pytest
+from sqlalchemy.dialects import mssql
+
+from methods.fetch_demographics import _cached_cases_select, _cached_patients_select
+
+@pytest.mark.parametrize(
+    "stmt, param",
+    [
+        (_cached_cases_select(("case_number", "patient_body_weight", "patient_body_height")), "case_numbers"),
+        (_cached_patients_select(("patient_id", "patient_body_weight")), "patient_ids"),
+    ],
+)
+def test_metric_selects_bind_the_id_list_once(stmt, param):
+    # each occurrence expands to one parameter per ID (2100-parameter limit on SQL Server)
+    sql = str(stmt.compile(dialect=mssql.dialect()))
+    assert sql.count(f"POSTCOMPILE_{param}") == 1
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_cases_fetcher_returns_berlin_case_times(monkeypatch, stream):
+    from datetime import datetime
+    import methods.fetch_demographics as M
+
+    rows = [{"case_number": "1", "case_admission_time": datetime(2025, 7, 1, 8, 0), "case_discharge_time": None}]
+    monkeypatch.setattr(M, "_execute", lambda session, stmt, params=None, stream=False: iter(rows) if stream else rows)
+    out = list(M.fetch_demography_for_cases(None, ["1"], stream=stream))
+    assert out[0]["case_admission_time"].isoformat() == "2025-07-01T10:00:00+02:00"
+    assert out[0]["case_discharge_time"] is None
@@ -0,0 +1,63 @@
+# tests/methods/test_fetch_values.py
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.dialects import mssql
+from sqlalchemy.orm import Session
+
+from methods.fetch_values import _VALUE_COLUMNS, fetch_values_for_patients, iter_value_partitions
+from models.sql_datadecimal63 import CO6DataDecimal63
+
+class _CapturingSession:
+    """Records the executed statement; returns no rows."""
+
+    def execute(self, stmt, params=None, execution_options=None):
+        self.stmt, self.execution_options = stmt, execution_options
+        class _Result:
+            def mappings(self):
+                return self
+            def partitions(self):
+                return iter(())
+        return _Result()
+
+def test_value_select_projects_columns_and_streams():
+    session = _CapturingSession()
+    list(iter_value_partitions(session, [1, 2], [6, 7], partition_size=500))
+    sql = str(session.stmt.compile(dialect=mssql.dialect()))
+    assert [c.name for c in session.stmt.selected_columns] == list(_VALUE_COLUMNS)
+    assert sql.count("POSTCOMPILE_Parent_ID") == 1 and sql.count("POSTCOMPILE_VarID") == 1
+    assert "deleted" in sql and "[FlagCurrent]" in sql
+    assert session.execution_options == {"yield_per": 500, "stream_results": True}
+
+@pytest.fixture
+def value_session():
+    engine = create_engine("sqlite://")
+    CO6DataDecimal63.__table__.create(engine)
+    rows = [
+        # (Parent_ID, VarID, deleted, FlagCurrent)
+        (1, 6, 0, 1), (1, 6, 0, 1), (1, 7, 0, 1), (2, 6, 0, 1), (2, 6, 0, 1),
+        (2, 6, 1, 1),  # deleted
+        (2, 6, 0, 0),  # superseded version
+        (3, 6, 0, 1),  # other patient
+        (1, 8, 0, 1),  # other VARID
+    ]
+    with Session(engine) as session:
+        session.execute(insert(CO6DataDecimal63), [
+            {"Version": i, "PreviousVersion": 0, "ID": i, "EntryUser": 0, "EntryTime": datetime(2025, 1, 1),
+             "Parent_ID": p, "Parent_VarID": 0, "VarID": v, "DateTimeTo": datetime(2025, 1, 1, i),
+             "validated": True, "val": float(i), "deleted": d, "FlagCurrent": fc, "Timestamp": bytes(8)}
+            for i, (p, v, d, fc) in enumerate(rows)
+        ])
+        yield session
+
+def test_values_come_in_partitions_of_the_requested_size(value_session):
+    partitions = list(iter_value_partitions(value_session, [1, 2], [6, 7], partition_size=2))
+    assert [len(p) for p in partitions] == [2, 2, 1]
+    rows = [dict(r) for p in partitions for r in p]
+    assert sorted(r["val"] for r in rows) == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert set(rows[0]) == set(_VALUE_COLUMNS)
+
+def test_fetch_values_for_patients_flattens_partitions(value_session):
+    rows = list(fetch_values_for_patients(value_session, [1], [6]))
+    assert [r["val"] for r in rows] == [0.0, 1.0]
@@ -0,0 +1,31 @@
+# tests/pipeline/test_audit_logger.py
+import io
+import json
+
+from pipeline.audit_logger import AuditLogger
+
+class _CountingStream(io.StringIO):
+    flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+def _log(audit, ids):
+    audit.log_access(
+        actor="t", action="fetch", resource="demographics", by="cases", ids=ids,
+        fields=None, fetch_fields=None, include_fields=None, derived_added=[],
+        hashed=False, out=None, out_format=None, rows=len(ids),
+    )
+
+def test_audit_logger_buffers_until_flush():
+    stream = _CountingStream()
+    audit = AuditLogger(stream=stream, include_id_samples=True, id_hash_salt="s")
+    _log(audit, ["1", "2"])
+    _log(audit, ["3"])
+    assert stream.flushes == 0
+    audit.close()
+    assert stream.flushes == 1
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [r["ids"]["count"] for r in lines] == [2, 1]
+    assert len(lines[0]["ids"]["hashed_ids"][0]) == 12
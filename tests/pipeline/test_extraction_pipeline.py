@@ -0,0 +1,16 @@
+# tests/pipeline/test_extraction_pipeline.py
+from pipeline._pipeline_helpers import _arrow_schema_for
+from pipeline.extraction_pipeline import DEMOGRAPHICS_SPEC, _default_columns_for
+
+def test_default_columns_are_fetched_and_derived_fields_only():
+    names = _arrow_schema_for(DEMOGRAPHICS_SPEC.schema_cls).names
+    assert _default_columns_for(DEMOGRAPHICS_SPEC, "cases", names) == [
+        "case_number",
+        "patient_sex",
+        "case_admission_time",
+        "case_discharge_time",
+        "patient_age_today",
+        "patient_age_at_admission",
+    ]
+    # metrics are never fetched by default; DOB is excluded by default
+    assert _default_columns_for(DEMOGRAPHICS_SPEC, "patients", names) == ["patient_sex", "patient_age_today"]
@@ -0,0 +1,94 @@
+# tests/pipeline/test_pipeline_helpers.py
+import logging
+from datetime import date
+
+import pytest
+
+from pipeline._pipeline_helpers import _validate_with_model
+from schemas.demographics import DemographicsOut
+
+def test_validate_with_model_drops_invalid_rows_and_reports_index(caplog):
+    rows = [
+        {"case_number": "1", "patient_sex": "w", "patient_date_of_birth": date(1990, 1, 1)},
+        {"patient_sex": "m"},  # missing case_number
+        {"case_number": "3", "patient_body_weight": "heavy"},
+    ]
+    with caplog.at_level(logging.WARNING):
+        cleaned = _validate_with_model(rows, DemographicsOut)
+    assert [r["case_number"] for r in cleaned] == ["1"]
+    assert cleaned[0]["patient_sex"] == "F"
+    assert "patient_date_of_birth" not in cleaned[0]
+    warnings = [r.getMessage() for r in caplog.records if r.levelno == logging.WARNING]
+    assert warnings[0].startswith("validation issue: row 1: case_number")
+    assert warnings[1].startswith("validation issue: row 2: patient_body_weight")
+
+def test_validate_with_model_include_and_hash():
+    rows = [{"case_number": "007", "patient_date_of_birth": date(1992, 12, 13)}]
+    cleaned = _validate_with_model(rows, DemographicsOut, hash_salt="secret", include={"patient_date_of_birth"})
+    assert cleaned[0]["patient_date_of_birth"] == date(1992, 12, 13)
+    assert cleaned[0]["case_number"] == DemographicsOut(case_number="007").dump_hashed(salt="secret")["case_number"]
+
+def test_ttl_cache_expires_and_evicts_lru(monkeypatch):
+    from pipeline import _pipeline_helpers as H
+
+    now = {"t": 0.0}
+    monkeypatch.setattr(H.time, "monotonic", lambda: now["t"])
+    cache = H._TTLCache(maxsize=2)
+    cache.put("a", 1, ttl=10)
+    cache.put("b", 2, ttl=10)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3, ttl=10)
+    assert cache.get("b") is None
+    now["t"] = 11.0
+    assert cache.get("a") is None and cache.get("c") is None
+
+def test_csv_writer_format(tmp_path):
+    from datetime import datetime
+    import pyarrow as pa
+    from helpers.datetime_helpers import _BERLIN
+    from pipeline._pipeline_helpers import _CsvWriter
+
+    ts = pa.timestamp("us", tz="Europe/Berlin")
+    table = pa.table({
+        "case_number": ["1", "2"],
+        "case_admission_time": pa.array(
+            [datetime(2025, 7, 1, 10, tzinfo=_BERLIN), datetime(2025, 1, 1, 10, 0, 0, 123000, tzinfo=_BERLIN)], ts
+        ),
+        "patient_age_today": pa.array([46, None], pa.int64()),
+    })
+    path = tmp_path / "o.csv"
+    writer = _CsvWriter(str(path), table.schema)
+    writer.write_table(table)
+    # a later chunk with special characters doesn't change the quoting policy
+    writer.write_table(pa.table({
+        "case_number": ['3, "x"'],
+        "case_admission_time": pa.array([datetime(2025, 7, 1, 10, tzinfo=_BERLIN)], ts),
+        "patient_age_today": pa.array([1], pa.int64()),
+    }))
+    writer.close()
+    assert path.read_text().splitlines() == [
+        "case_number,case_admission_time,patient_age_today",
+        '"1","2025-07-01 10:00:00+02:00",46',
+        '"2","2025-01-01 10:00:00.123000+01:00",',
+        '"3, ""x""","2025-07-01 10:00:00+02:00",1',
+    ]
+
+@pytest.mark.parametrize("ext", ["csv", "parquet", "jsonl"])
+def test_open_writer_leaves_no_output_when_the_run_fails(tmp_path, ext):
+    import pyarrow as pa
+    from pipeline._pipeline_helpers import _open_writer
+
+    table = pa.table({"case_number": ["1", "2"]})
+    out = tmp_path / f"o.{ext}"
+    out.write_text("previous run")
+    with pytest.raises(RuntimeError):
+        with _open_writer(str(out), None, table.schema) as writer:
+            writer.write_table(table)
+            raise RuntimeError("fetch failed mid-stream")
+    assert out.read_text() == "previous run"
+    assert [p.name for p in tmp_path.iterdir()] == [out.name]
+
+    with _open_writer(str(out), None, table.schema) as writer:
+        writer.write_table(table)
+    assert out.read_bytes() != b"previous run"
+    assert [p.name for p in tmp_path.iterdir()] == [out.name]
@@ -41,4 +41,66 @@ def test_dump_hashed_hashes_case_number_and_excludes_dob(demo):
 def test_dump_hashed_can_include_dob(demo):
     data = demo.dump_hashed(salt="secret", include={"patient_date_of_birth"})
     assert isinstance(data["case_number"], str) and len(data["case_number"]) == 12
-    assert "patient_date_of_birth" in data
\ No newline at end of file
+    assert "patient_date_of_birth" in data
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [("Männlich", "M"), (" w ", "F"), ("W", "F"), ("m", "M"), ("x", "U"), (" ", None),
+     ("DIVERS", "D"), ("xyz", "U"), ("", None), (None, None)],
+)
+def test_patient_sex_is_normalized(raw, expected):
+    assert DemographicsOut(case_number="1", patient_sex=raw).patient_sex == expected
+
+def test_normalize_table_matches_row_normalization():
+    pa = pytest.importorskip("pyarrow")
+    raw = ["Männlich", " w ", "DIVERS", "xyz", "", None, "F"]
+    table = pa.table({"patient_sex": raw, "case_number": [str(i) for i in range(len(raw))]})
+    out = DemographicsOut.normalize_table(table)
+    assert out.column("patient_sex").to_pylist() == [DemographicsOut._normalize_value("patient_sex", v) for v in raw]
+    assert out.column("case_number").equals(table.column("case_number"))
+
+def test_fast_dump_matches_model_dump(demo):
+    assert DemographicsOut._fast_dump is not None
+    default = {"exclude_none": True, "exclude_unset": True, "exclude": {"patient_date_of_birth"}}
+    assert demo.dump_clean() == demo.model_dump(**default)
+    assert demo.dump_hashed(salt="secret") == demo.model_dump(**default, context={"salt": "secret"})
+    include = {"patient_date_of_birth"}
+    assert demo.dump_clean(include=include) == demo.model_dump(exclude_none=True, exclude_unset=True)
+    assert demo.dump_hashed(salt="secret", exclude={"patient_sex"}) == demo.model_dump(
+        **{**default, "exclude": {"patient_date_of_birth", "patient_sex"}}, context={"salt": "secret"}
+    )
+
+def test_from_row_matches_validated_model(demo):
+    row = {
+        "case_number": "007",
+        "patient_sex": "m",
+        "patient_date_of_birth": date(1992, 12, 13),
+        "case_admission_time": datetime(2025, 10, 1, 8, 0),
+        "not_a_field": 1,
+    }
+    built = DemographicsOut.from_row(row)
+    assert built.patient_sex == "M"
+    assert built.dump_hashed(salt="secret") == demo.dump_hashed(salt="secret")
+
+def test_age_at_admission_is_none_when_born_after_admission():
+    m = DemographicsOut(
+        case_number="1",
+        patient_date_of_birth=date(2025, 10, 2),
+        case_admission_time=datetime(2025, 10, 1, 8, 0),
+    )
+    assert m.patient_age_at_admission is None
+    assert "patient_age_at_admission" not in m.dump_clean()
+
+def test_fast_dump_respects_field_level_exclude():
+    from pydantic import Field
+    from pipeline._pipeline_helpers import _validate_with_model
+    from schemas.base_schema_out import BaseSchema
+
+    class WithSecret(BaseSchema):
+        a: str
+        secret: str | None = Field(default=None, exclude=True)
+
+    m = WithSecret(a="x", secret="y")
+    assert m.dump_clean() == m.model_dump() == {"a": "x"}
+    assert m.dump_clean(exclude={"a"}) == m.model_dump(exclude={"a"}) == {}
+    assert _validate_with_model([{"a": "x", "secret": "y"}], WithSecret) == [{"a": "x"}]